@@ -1,39 +1,223 @@
+import argparse
+import hashlib
+import json
 import os
 import re
+import shutil
 import sys
+import tempfile
+import threading
+import time
+import zipfile
 import requests
-from bs4 import BeautifulSoup
-from markdownify import markdownify as md
+import xml.etree.ElementTree as ET
+from bs4 import BeautifulSoup, Tag
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from markdownify import MarkdownConverter
 from datetime import datetime
+from importlib.util import find_spec
+from requests.adapters import HTTPAdapter
 from slugify import slugify
+from urllib3.util import Retry
+
+# BeautifulSoup's lxml tree builder when lxml is installed (optional: the
+# pure-Python html.parser is several times slower on Medium's pages).
+HTML_PARSER = "lxml" if find_spec("lxml") else "html.parser"
+
+# Images are fetched this many at a time, over as many pooled connections;
+# in batch mode the limit is global, shared by all articles in flight.
+DOWNLOAD_WORKERS = 8
+ARTICLE_WORKERS = 4
+
+_print_lock = threading.Lock()
+
+def log(message):
+    """print() from worker threads without interleaving lines."""
+    with _print_lock:
+        print(message)
+
+def make_session(pool_size=DOWNLOAD_WORKERS, retries=3, backoff=0.5):
+    """A requests.Session with a connection pool sized for the download
+    workers, retrying connection errors and 429/5xx with exponential backoff
+    (0.5 s, 1 s, 2 s; Retry-After is honoured)."""
+    retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=frozenset(["GET", "HEAD"]))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
 def sanitize_filename(filename):
     return re.sub(r'[<>:"/\\|?*]', '_', filename)
 
-def download_image(img_url, output_dir):
+def image_file_name(img_url):
     file_name = os.path.basename(img_url.split("?")[0])
     file_name = sanitize_filename(file_name)
     if "." not in file_name:
         file_name += ".png"
-    file_path = os.path.join(output_dir, file_name)
+    return file_name
+
+# Downloaded images live once per content in IMAGE_STORE and are hard-linked
+# into the article folders, so the same picture in ten articles is stored
+# once. The store's manifest.json maps every URL to its blob and validators.
+# Blobs are read-only: editing a linked image in place would otherwise
+# rewrite the blob, and with it every article that links it. Save edits
+# under a new name (or delete the link first) instead.
+BLOB_MODE = 0o444
+IMAGE_STORE = ".medium-store"
+CHUNK_SIZE = 64 * 1024
+
+class ImageStore:
+    """Content-addressed downloads: blobs named <sha256><ext>, plus a manifest
+    of url -> {blob, etag, last_modified} used for conditional re-fetches."""
+
+    def __init__(self, root=IMAGE_STORE):
+        self.root = root
+        self.manifest_path = os.path.join(root, "manifest.json")
+        self.lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def fetch(self, url, session, suffix=""):
+        """(blob path, bytes received) for url's current content. A known URL
+        whose blob is still here is asked for with If-None-Match /
+        If-Modified-Since, and a 304 moves no body at all."""
+        entry = self.entries.get(url)
+        headers = {}
+        if entry and os.path.exists(os.path.join(self.root, entry["blob"])):
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        with session.get(url, headers=headers, timeout=10, stream=True) as r:
+            if r.status_code == 304 and headers:
+                return os.path.join(self.root, entry["blob"]), 0
+            r.raise_for_status()
+            blob, received = self._write_blob(r, suffix)
+        with self.lock:
+            self.entries[url] = {"blob": blob, "etag": r.headers.get("ETag"),
+                                 "last_modified": r.headers.get("Last-Modified")}
+        return os.path.join(self.root, blob), received
+
+    def _write_blob(self, response, suffix):
+        """Stream the body to a temp file while hashing it, then rename it to
+        its content name (or drop it if that content is already stored)."""
+        digest = hashlib.sha256()
+        received = 0
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    digest.update(chunk)
+                    f.write(chunk)
+                    received += len(chunk)
+            blob = digest.hexdigest() + suffix
+            if os.path.exists(os.path.join(self.root, blob)):
+                os.unlink(tmp)
+            else:
+                os.chmod(tmp, BLOB_MODE)
+                os.replace(tmp, os.path.join(self.root, blob))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        return blob, received
+
+    def link(self, blob_path, dest):
+        """Put the blob at dest: a (read-only) hard link, or a plain copy across filesystems."""
+        os.chmod(blob_path, BLOB_MODE)  # blobs stored before they were made read-only
+        if os.path.exists(dest) and os.path.samefile(blob_path, dest):
+            return
+        tmp = dest + ".part"
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        try:
+            os.link(blob_path, tmp)
+        except OSError:
+            shutil.copyfile(blob_path, tmp)
+        os.replace(tmp, dest)
+
+    def save(self):
+        with self.lock:
+            fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.manifest_path)
+
+def download_image(img_url, output_dir, session, store, file_names=None):
+    """Bytes received for img_url (0 if the stored copy is current), fetched
+    once and saved into output_dir under each of file_names (by default its
+    own name); None if it could not be fetched."""
+    file_names = file_names or [image_file_name(img_url)]
     try:
-        r = requests.get(img_url, timeout=10)
-        r.raise_for_status()
-        with open(file_path, "wb") as f:
-            f.write(r.content)
-        print(f"Downloaded {file_name}")
-        return file_name
+        blob_path, received = store.fetch(img_url, session, os.path.splitext(image_file_name(img_url))[1])
+        for file_name in file_names:
+            store.link(blob_path, os.path.join(output_dir, file_name))
+        log(f"{'Downloaded' if received else 'Unchanged'} {', '.join(file_names)}")
+        return received
     except Exception as e:
-        print(f"Failed to download {img_url}: {e}")
+        log(f"Failed to download {img_url}: {e}")
         return None
 
-def clean_medium_content(article):
-    # Remove only Medium-specific elements
-    for unwanted in article.select(
-        "header, footer, aside, div[class*='js-postShareWidget'], div[class*='clapButton'], div[class*='pw-post-meta'], div[data-testid='socialStats'], div[data-testid='postActionsBar']"
-    ):
-        unwanted.decompose()
-    return article
+# Medium-specific elements dropped from the export: these tags, and divs whose
+# class contains one of these names or with one of these data-testids.
+UNWANTED_TAGS = {"header", "footer", "aside"}
+UNWANTED_DIV_CLASSES = ("js-postShareWidget", "clapButton", "pw-post-meta")
+UNWANTED_DIV_TESTIDS = {"socialStats", "postActionsBar"}
+
+def is_unwanted(tag):
+    if tag.name in UNWANTED_TAGS:
+        return True
+    if tag.name != "div":
+        return False
+    if tag.get("data-testid") in UNWANTED_DIV_TESTIDS:
+        return True
+    classes = " ".join(tag.get("class", ()))
+    return any(name in classes for name in UNWANTED_DIV_CLASSES)
+
+class ArticleParts:
+    """Everything the export rewrites, found in one walk over the article:
+    the hero (first) figure, Medium chrome, code blocks, the other figures
+    and the <img> tags outside any figure. Subtrees that get replaced or
+    removed whole are not descended into."""
+
+    def __init__(self, article):
+        self.hero = None
+        self.unwanted = []
+        self.code_blocks = []
+        self.figures = []
+        self.images = []
+        self._visit(article, hidden=False)
+
+    def _visit(self, tag, hidden):
+        for child in tag.children:
+            if not isinstance(child, Tag):
+                continue
+            if child.name == "figure" and self.hero is None:
+                self.hero = child
+            elif hidden:
+                # Inside removed chrome only the hero can still turn up.
+                if self.hero is None:
+                    self._visit(child, hidden=True)
+            elif is_unwanted(child):
+                self.unwanted.append(child)
+                if self.hero is None:
+                    self._visit(child, hidden=True)
+            elif child.name == "figure":
+                self.figures.append(child)
+            elif child.name == "pre":
+                self.code_blocks.append(child)
+            else:
+                if child.name == "img":
+                    self.images.append(child)
+                self._visit(child, hidden=False)
+
+DATE_RE = re.compile(r"\b([A-Z][a-z]{2,8} \d{1,2}, \d{4})\b")
 
 def extract_metadata(soup, article):
     # TITLE
@@ -54,7 +238,6 @@ def extract_metadata(soup, article):
 
     # DESCRIPTION: get subtitle/description from h2 after h1
     description = ""
-    h1 = soup.find("h1")
     if h1:
         # Look for h2 right after h1 (subtitle)
         h2 = h1.find_next("h2")
@@ -66,9 +249,9 @@ def extract_metadata(soup, article):
         if first_p:
             description = first_p.get_text(strip=True)
 
-    # DATE
-    text = soup.get_text(" ")
-    date_match = re.search(r"\b([A-Z][a-z]{2,8} \d{1,2}, \d{4})\b", text)
+    # DATE: the first text node holding one; Medium's is near the top, so
+    # the rest of the page is never visited
+    date_match = next(filter(None, map(DATE_RE.search, soup.strings)), None)
     date = ""
     if date_match:
         try:
@@ -79,36 +262,106 @@ def extract_metadata(soup, article):
 
     return title, description, date
 
-def download_figure_images(article, output_dir):
-    for fig in article.find_all("figure"):
-        source_tags = fig.find_all("source")
-        img_url = None
-        if source_tags:
-            max_width = 0
-            for src in source_tags:
-                srcset = src.get("srcset", "")
-                if not srcset:
-                    continue
-                for item in srcset.split(","):
-                    parts = item.strip().split(" ")
-                    if len(parts) == 2:
-                        url, w = parts
-                        try:
-                            w_val = int(re.sub("[^0-9]", "", w))
-                            if w_val > max_width:
-                                max_width = w_val
-                                img_url = url
-                        except:
-                            continue
-        if not img_url:
-            img_tag = fig.find("img")
-            if img_tag and img_tag.get("src"):
-                img_url = img_tag.get("src")
-        if not img_url:
-            continue
-        local_name = download_image(img_url, output_dir)
-        if local_name:
-            fig.replace_with(f"\n![{local_name}]({local_name})\n")
+def download_images(jobs, output_dir, session, store, pool=None):
+    """Download (url, file_name) jobs concurrently on pool (or a private one of
+    DOWNLOAD_WORKERS). Each file name is written once, from the first URL
+    listed for it, and each URL is fetched once however many names it has.
+    Returns (file names saved, {url: bytes received or None})."""
+    url_by_name = {}
+    for img_url, file_name in jobs:
+        url_by_name.setdefault(file_name, img_url)
+    names_by_url = {}
+    for file_name, img_url in url_by_name.items():
+        names_by_url.setdefault(img_url, []).append(file_name)
+    if pool is None:
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as own_pool:
+            return download_images(jobs, output_dir, session, store, own_pool)
+    results = pool.map(lambda item: download_image(item[0], output_dir, session, store, item[1]),
+                       names_by_url.items())
+    received = dict(zip(names_by_url, results))
+    store.save()
+    saved = {name for img_url, names in names_by_url.items() if received[img_url] is not None for name in names}
+    return saved, received
+
+def srcset_candidates(srcset):
+    """(width, url) for each "url 1400w" candidate of a srcset attribute
+    (pixel densities like "2x" rank the same way)."""
+    candidates = []
+    for item in srcset.split(","):
+        parts = item.split()
+        if len(parts) == 2 and parts[1][-1:] in ("w", "x"):
+            try:
+                candidates.append((float(parts[1][:-1]), parts[0]))
+            except ValueError:
+                continue
+    return candidates
+
+def resolve_image(tag, width=None):
+    """The URL to download for a figure, <picture> or <img>. Among the srcset
+    candidates of its <source> tags (or of the <img> when there are none) it
+    is the largest, or with width set the smallest at least that wide (the
+    largest if none is); without candidates, the <img> src."""
+    img = tag if tag.name == "img" else tag.find("img")
+    candidates = []
+    if tag.name != "img":
+        for source in tag.find_all("source"):
+            candidates += srcset_candidates(source.get("srcset", ""))
+    if not candidates and img is not None:
+        candidates = srcset_candidates(img.get("srcset", ""))
+    if candidates:
+        wide_enough = [c for c in candidates if width and c[0] >= width]
+        if wide_enough:
+            return min(wide_enough, key=lambda c: c[0])[1]
+        return max(candidates, key=lambda c: c[0])[1]
+    return img.get("src") if img is not None else None
+
+def prepare_article(html, image_width=None):
+    """Parse a Medium page and strip its <article> down to what is exported.
+    Returns (article, title, description, date, hero image URL, images), images
+    being the (tag, url) pairs still to download, resolved by resolve_image
+    with image_width; the hero figure and Medium chrome are gone and code
+    blocks are fenced already."""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    article = soup.find("article")
+    if not article:
+        raise ValueError("Could not find <article> tag.")
+
+    title, description, date = extract_metadata(soup, article)
+    parts = ArticleParts(article)
+
+    # The first/hero figure becomes thumbnail.png, not part of the markdown
+    hero_url = None
+    if parts.hero is not None:
+        hero_url = resolve_image(parts.hero, image_width)
+        parts.hero.decompose()
+
+    for unwanted in parts.unwanted:
+        unwanted.decompose()
+
+    # CODE BLOCKS
+    for pre in parts.code_blocks:
+        code_block = pre.get_text(strip=True)
+        lang_tag = ""
+        if pre.code and pre.code.has_attr("class"):
+            for c in pre.code["class"]:
+                if c.startswith("language-"):
+                    lang_tag = c.replace("language-", "")
+        pre.replace_with(f"\n```{lang_tag}\n{code_block}\n```\n")
+
+    # FIGURE / PICTURE IMAGES AND OTHER IMAGES NOT IN FIGURE
+    images = []
+    for tag in parts.figures + parts.images:
+        img_url = resolve_image(tag, image_width)
+        if img_url:
+            images.append((tag, img_url))
+    return article, title, description, date, hero_url, images
+
+def link_images(images, saved):
+    """Replace each (tag, url) whose file is in saved by a Markdown image."""
+    for tag, img_url in images:
+        local_name = image_file_name(img_url)
+        if local_name in saved:
+            tag.replace_with(f"\n![{local_name}]({local_name})\n")
 
 def clean_markdown_metadata(markdown_text, title, description):
     """Remove Medium metadata from markdown text"""
@@ -164,87 +417,11 @@ def clean_markdown_metadata(markdown_text, title, description):
     
     return "\n".join(cleaned_lines).strip()
 
-def medium_to_markdown(url):
-    res = requests.get(url)
-    res.raise_for_status()
-    soup = BeautifulSoup(res.text, "html.parser")
-    article = soup.find("article")
-    if not article:
-        raise ValueError("Could not find <article> tag.")
-    
-    title, description, date = extract_metadata(soup, article)
-    
-    # Find and download the first/hero image as thumbnail before cleaning
-    slug = slugify(title)
-    os.makedirs(slug, exist_ok=True)
-    
-    first_figure = article.find("figure")
-    if first_figure:
-        source_tags = first_figure.find_all("source")
-        img_url = None
-        if source_tags:
-            max_width = 0
-            for src in source_tags:
-                srcset = src.get("srcset", "")
-                if not srcset:
-                    continue
-                for item in srcset.split(","):
-                    parts = item.strip().split(" ")
-                    if len(parts) == 2:
-                        url_part, w = parts
-                        try:
-                            w_val = int(re.sub("[^0-9]", "", w))
-                            if w_val > max_width:
-                                max_width = w_val
-                                img_url = url_part
-                        except:
-                            continue
-        if not img_url:
-            img_tag = first_figure.find("img")
-            if img_tag and img_tag.get("src"):
-                img_url = img_tag.get("src")
-        
-        # Download as thumbnail
-        if img_url:
-            try:
-                r = requests.get(img_url, timeout=10)
-                r.raise_for_status()
-                thumbnail_path = os.path.join(slug, "thumbnail.png")
-                with open(thumbnail_path, "wb") as f:
-                    f.write(r.content)
-                print(f"Downloaded thumbnail.png")
-            except Exception as e:
-                print(f"Failed to download thumbnail: {e}")
-        
-        # Remove the first figure so it doesn't appear in the markdown
-        first_figure.decompose()
-    
-    article = clean_medium_content(article)
-
-    # CODE BLOCKS
-    for pre in article.find_all("pre"):
-        code_block = pre.get_text(strip=True)
-        lang_tag = ""
-        if pre.code and pre.code.has_attr("class"):
-            for c in pre.code["class"]:
-                if c.startswith("language-"):
-                    lang_tag = c.replace("language-", "")
-        pre.replace_with(f"\n```{lang_tag}\n{code_block}\n```\n")
-
-    # FIGURE / PICTURE IMAGES
-    download_figure_images(article, slug)
-
-    # OTHER IMAGES NOT IN FIGURE
-    for img in article.find_all("img"):
-        img_url = img.get("src")
-        if not img_url:
-            continue
-        local_name = download_image(img_url, slug)
-        if local_name:
-            img.replace_with(f"\n![{local_name}]({local_name})\n")
-
-    # CONVERT TO MARKDOWN
-    markdown_text = md(str(article))
+def article_markdown(article, title, description, date):
+    """The article.md text for a prepared article: front matter, description,
+    then the body, converted straight from the parsed tree (no re-parse)."""
+    article.smooth()  # merge the text nodes left by replace_with, as a re-parse would
+    markdown_text = MarkdownConverter().convert_soup(article)
     markdown_text = re.sub(r"\n{3,}", "\n\n", markdown_text)
     markdown_text = re.sub(r"\n\s*—+\s*\n", "\n\n", markdown_text)
     
@@ -258,15 +435,187 @@ description: {description}
 ---
 """
 
-    final_md = front_matter + "\n" + description + "\n\n---\n\n" + markdown_text
+    return front_matter + "\n" + description + "\n\n---\n\n" + markdown_text
+
+def medium_to_markdown(url, session=None, store=None, pool=None, image_width=None):
+    """Export one article to <slug>/article.md, its images resolved with
+    image_width (see resolve_image); returns its slug, stage timings
+    (seconds) and image counts."""
+    started = time.perf_counter()
+    session = session or make_session()
+    store = store or ImageStore()
+    res = session.get(url, timeout=30)
+    res.raise_for_status()
+    fetched_page = time.perf_counter()
+    article, title, description, date, thumbnail_url, images = prepare_article(res.text, image_width)
+
+    slug = slugify(title)
+    os.makedirs(slug, exist_ok=True)
+
+    # All images at once, the hero as thumbnail.png (fetched once even if a
+    # figure shows the same picture)
+    jobs = [(thumbnail_url, "thumbnail.png")] if thumbnail_url else []
+    jobs += [(img_url, image_file_name(img_url)) for _, img_url in images]
+    images_started = time.perf_counter()
+    saved, received = download_images(jobs, slug, session, store, pool)
+    images_done = time.perf_counter()
+    link_images(images, saved)
+    fetched = [n for n in received.values() if n]
+    unchanged = sum(n == 0 for n in received.values())
+    log(f"✓ {slug}: {len(fetched)} image(s) downloaded ({sum(fetched) / 1e6:.1f} MB), {unchanged} unchanged")
+
     md_path = os.path.join(slug, "article.md")
     with open(md_path, "w", encoding="utf-8") as f:
-        f.write(final_md)
+        f.write(article_markdown(article, title, description, date))
 
-    print(f"\n✅ Export complete: {md_path}")
+    log(f"✅ Export complete: {md_path}")
+    total = time.perf_counter() - started
+    return {"slug": slug, "seconds": total, "page": fetched_page - started,
+            "images": images_done - images_started,
+            "convert": total - (fetched_page - started) - (images_done - images_started),
+            "downloaded": len(fetched), "unchanged": unchanged, "bytes": sum(fetched)}
+
+# ---------------------------------------------------------------------------
+# Batch mode: a list of URLs, a Medium RSS feed or a Medium archive export,
+# exported ARTICLE_WORKERS at a time. Finished articles are appended to a
+# journal, so an interrupted run picks up where it stopped.
+# ---------------------------------------------------------------------------
+
+def read_batch(source):
+    """Article URLs from a text file (one per line, # comments), an RSS/Atom
+    feed, or Medium's archive export (its folder or .zip, posts/*.html)."""
+    if os.path.isdir(source):
+        posts = []
+        for dirpath, _, filenames in os.walk(source):
+            posts += [os.path.join(dirpath, n) for n in sorted(filenames) if n.endswith(".html")]
+        return _canonical_urls(_read_text(path) for path in posts)
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            posts = [n for n in archive.namelist() if n.startswith("posts/") and n.endswith(".html")]
+            return _canonical_urls(archive.read(n).decode("utf-8") for n in posts)
+    with open(source, "r", encoding="utf-8") as f:
+        text = f.read()
+    if text.lstrip().startswith("<"):
+        root = ET.fromstring(text)
+        links = [link.text for link in root.iter("link") if link.text]  # RSS <item><link>
+        links += [link.get("href") for link in root.iter("{http://www.w3.org/2005/Atom}link")
+                  if link.get("rel", "alternate") == "alternate"]
+        # Medium tags feed links with ?source=rss...; the channel's own link is the blog, not a post.
+        channel = root.find("channel/link")
+        return list(dict.fromkeys(l.split("?")[0] for l in links if channel is None or l != channel.text))
+    return list(dict.fromkeys(line.strip() for line in text.splitlines()
+                              if line.strip() and not line.lstrip().startswith("#")))
+
+def _read_text(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+def _canonical_urls(pages):
+    """The published URL of each exported post (drafts have none)."""
+    urls = []
+    for html in pages:
+        link = BeautifulSoup(html, "html.parser").find("a", class_="p-canonical")
+        if link and link.get("href"):
+            urls.append(link["href"])
+    return list(dict.fromkeys(urls))
+
+def finished_urls(journal_path):
+    """URLs whose latest journal entry is a successful export."""
+    status = {}
+    try:
+        with open(journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by a crash
+                status[entry["url"]] = entry["status"]
+    except OSError:
+        pass
+    return {url for url, state in status.items() if state == "ok"}
+
+def export_batch(urls, jobs=ARTICLE_WORKERS, image_workers=DOWNLOAD_WORKERS, journal_path=None, image_width=None):
+    """Export urls on `jobs` threads, all sharing one session, store and pool of
+    image_workers downloads. With a journal, URLs already exported are
+    skipped and each finished one is recorded. Returns the per-article results."""
+    urls = list(dict.fromkeys(urls))
+    if journal_path:
+        done = finished_urls(journal_path)
+        if done & set(urls):
+            print(f"· Skipping {len(done & set(urls))} article(s) already exported (see {journal_path})")
+        urls = [url for url in urls if url not in done]
+    session = make_session(pool_size=image_workers + jobs)
+    store = ImageStore()
+    journal = open(journal_path, "a", encoding="utf-8") if journal_path else None
+    results = []
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=image_workers) as image_pool, \
+            ThreadPoolExecutor(max_workers=jobs) as article_pool:
+        futures = {article_pool.submit(medium_to_markdown, url, session, store, image_pool, image_width): url
+                   for url in urls}
+        try:
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    result = dict(future.result(), url=url, status="ok")
+                except Exception as e:
+                    log(f"❌ {url}: {e}")
+                    result = {"url": url, "status": "failed", "error": str(e)}
+                results.append(result)
+                if journal:
+                    journal.write(json.dumps(result) + "\n")
+                    journal.flush()
+        except KeyboardInterrupt:
+            for future in futures:
+                future.cancel()
+            print(f"\n⚠️  Interrupted: {len(results)} of {len(urls)} article(s) finished"
+                  + (f", rerun to resume from {journal_path}" if journal else ""))
+            raise
+        finally:
+            if journal:
+                journal.close()
+    if len(urls) > 1:
+        print_batch_summary(results, time.perf_counter() - started)
+    return results
+
+def print_batch_summary(results, seconds):
+    ok = [r for r in results if r["status"] == "ok"]
+    failed = [r for r in results if r["status"] != "ok"]
+    print(f"\n📊 {len(ok)} article(s) exported, {len(failed)} failed in {seconds:.1f} s")
+    if ok:
+        print(f"{'total s':>8}{'page s':>8}{'images s':>10}{'convert s':>11}{'new':>5}{'same':>6}{'MB':>7}  article")
+        for r in sorted(ok, key=lambda r: r["seconds"], reverse=True):
+            print(f"{r['seconds']:>8.2f}{r['page']:>8.2f}{r['images']:>10.2f}{r['convert']:>11.2f}"
+                  f"{r['downloaded']:>5}{r['unchanged']:>6}{r['bytes'] / 1e6:>7.1f}  {r['slug']}")
+    for r in failed:
+        print(f"❌ {r['url']}: {r['error']}")
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python medium_to_md.py <medium_article_url>")
-        sys.exit(1)
-    medium_to_markdown(sys.argv[1])
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Export Medium articles to <slug>/article.md.")
+    parser.add_argument("urls", nargs="*", help="article URLs")
+    parser.add_argument("--batch", metavar="SOURCE",
+                        help="file of URLs, RSS/Atom feed, or Medium archive export (folder or .zip)")
+    parser.add_argument("--jobs", type=int, default=ARTICLE_WORKERS,
+                        help=f"articles exported at once (default {ARTICLE_WORKERS})")
+    parser.add_argument("--image-workers", type=int, default=DOWNLOAD_WORKERS,
+                        help=f"image downloads at once, across all articles (default {DOWNLOAD_WORKERS})")
+    parser.add_argument("--image-width", type=int, metavar="PX",
+                        help="download the smallest srcset candidate at least PX wide instead of the largest")
+    parser.add_argument("--fresh", action="store_true", help="ignore the batch journal and export everything")
+    args = parser.parse_args()
+    if not args.urls and not args.batch:
+        parser.error("give article URLs or --batch SOURCE")
+
+    urls = list(args.urls)
+    journal_path = None
+    if args.batch:
+        urls += read_batch(args.batch)
+        journal_path = os.path.join(IMAGE_STORE, "journal.jsonl")
+        if args.fresh and os.path.exists(journal_path):
+            os.remove(journal_path)
+    try:
+        results = export_batch(urls, args.jobs, args.image_workers, journal_path, args.image_width)
+    except KeyboardInterrupt:
+        sys.exit(130)
+    if any(r["status"] != "ok" for r in results):
+        sys.exit(1)
\ No newline at end of file
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Page loads over HTTP/1.0 (a connection per request) vs HTTP/1.1 keep-alive.
+
+Serves the site (the repo root by default) with
+
+    http/1.0  serve.Handler as it was: one TCP connection per request
+    1.1       serve.Handler: persistent connections
+    async     serve.py --async: persistent connections on one event loop
+
+and loads an article the way a browser does: the page, then every same-site
+asset it references (figures, CSS, JS, fonts, iframes) over 6 parallel
+connections per host. Reported per server: TCP connections opened per page
+load, page-load time (p50 / p95) and per-request latency (p50 / p95).
+
+    python benchmarks/bench_keepalive.py                  # the article with the most assets
+    python benchmarks/bench_keepalive.py --page /articles/<slug>/ --loads 50
+"""
+
+import argparse
+import http.client
+import os
+import statistics
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+sys.path.insert(0, str(HERE))
+
+import serve  # noqa: E402
+from bench_sendfile import start_async, start_threaded  # noqa: E402
+
+CONNECTIONS_PER_HOST = 6  # what browsers open per origin
+
+
+class Http10Handler(serve.Handler):
+    """serve.Handler before keep-alive (http.server's default protocol)."""
+    protocol_version = 'HTTP/1.0'
+
+
+class AssetParser(HTMLParser):
+    ATTRS = {'img': 'src', 'script': 'src', 'link': 'href', 'iframe': 'src', 'source': 'src', 'video': 'poster'}
+
+    def __init__(self):
+        super().__init__()
+        self.urls = []
+
+    def handle_starttag(self, tag, attrs):
+        value = dict(attrs).get(self.ATTRS.get(tag))
+        if value and not urllib.parse.urlsplit(value).scheme and not value.startswith(('//', '#', 'data:')):
+            self.urls.append(value)
+
+
+def page_assets(page, html):
+    parser = AssetParser()
+    parser.feed(html.decode('utf-8', 'replace'))
+    seen = {}
+    for url in parser.urls:
+        seen.setdefault(urllib.parse.urljoin(page, url).split('#', 1)[0], None)
+    return list(seen)
+
+
+class CountingConnection(http.client.HTTPConnection):
+    opened = 0
+    _lock = threading.Lock()
+
+    def connect(self):
+        with CountingConnection._lock:
+            CountingConnection.opened += 1
+        super().connect()
+
+
+def get(conn, path, latencies):
+    start = time.perf_counter()
+    conn.request('GET', path, headers={'Accept-Encoding': 'gzip, br'})
+    response = conn.getresponse()
+    response.read()
+    latencies.append(time.perf_counter() - start)
+    return response
+
+
+def load_page(port, page, assets, pool):
+    """One browser-style page load; returns the per-request latencies."""
+    latencies = []
+    conns = [CountingConnection('127.0.0.1', port) for _ in range(CONNECTIONS_PER_HOST)]
+    get(conns[0], page, latencies)
+    list(pool.map(lambda i: [get(conns[i], path, latencies) for path in assets[i::CONNECTIONS_PER_HOST]],
+                  range(CONNECTIONS_PER_HOST)))
+    for conn in conns:
+        conn.close()
+    return latencies
+
+
+def busiest_article():
+    def asset_count(index):
+        return len(page_assets('/', index.read_bytes()))
+    pages = sorted(Path('articles').glob('*/index.html'), key=asset_count)
+    if not pages:
+        sys.exit("no built articles here (run generate.py first, or pass --page)")
+    return f'/{pages[-1].parent.as_posix()}/'
+
+
+def pct(values, q):
+    return statistics.quantiles(values, n=100)[q - 1] if len(values) > 1 else values[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Page-load benchmark: HTTP/1.0 vs keep-alive.")
+    parser.add_argument('--root', default=HERE.parent, type=Path, help="site to serve (default: the repo)")
+    parser.add_argument('--page', help="page to load (default: the article with the most assets)")
+    parser.add_argument('--loads', type=int, default=20, help="page loads per server (default 20)")
+    args = parser.parse_args()
+
+    os.chdir(args.root)
+    page = args.page or busiest_article()
+    servers = {'http/1.0': start_threaded(Http10Handler), '1.1': start_threaded(serve.Handler),
+               'async': start_async()}
+
+    probe = http.client.HTTPConnection('127.0.0.1', servers['1.1'])
+    probe.request('GET', page)
+    assets = page_assets(page, probe.getresponse().read())
+    probe.close()
+    print(f"{page}: page + {len(assets)} assets, {args.loads} loads, {CONNECTIONS_PER_HOST} connections/host\n")
+
+    print(f"{'server':<10}{'conns/load':>11}{'load p50 ms':>13}{'load p95 ms':>13}{'req p50 ms':>12}{'req p95 ms':>12}")
+    with ThreadPoolExecutor(CONNECTIONS_PER_HOST) as pool:
+        for name, port in servers.items():
+            load_page(port, page, assets, pool)  # warm the page cache and ETags
+            CountingConnection.opened = 0
+            loads, requests = [], []
+            for _ in range(args.loads):
+                start = time.perf_counter()
+                requests += load_page(port, page, assets, pool)
+                loads.append(time.perf_counter() - start)
+            print(f"{name:<10}{CountingConnection.opened / args.loads:>11.1f}"
+                  f"{pct(loads, 50) * 1e3:>13.1f}{pct(loads, 95) * 1e3:>13.1f}"
+                  f"{pct(requests, 50) * 1e3:>12.2f}{pct(requests, 95) * 1e3:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""HTML -> Markdown cost of articles/medium_export.py, without the network.
+
+Converts Medium pages the way medium_to_markdown does, treating every image
+as downloaded, with
+
+    legacy       the old pipeline: html.parser, a CSS select for the chrome,
+                 find_all() per element kind, get_text() over the whole page
+                 for the date, then markdownify(str(article)), which
+                 serializes the tree and parses it again
+    single-pass  prepare_article / article_markdown on html.parser
+    lxml         the same on the lxml tree builder (the default when installed)
+
+and reports the best time per page over the rounds, plus whether the
+Markdown matches the legacy output byte for byte.
+
+The pages are synthetic by default: seeded look-alikes of a Medium article
+(inline Apollo state and CSS in <head>, picture/srcset figures, highlighted
+code, header/footer chrome) at three sizes. Save real pages from a browser,
+or write the synthetic ones with --save, and benchmark those with --fixtures.
+
+    python benchmarks/bench_medium_export.py
+    python benchmarks/bench_medium_export.py --save fixtures/
+    python benchmarks/bench_medium_export.py --fixtures fixtures/ --rounds 20
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+from markdownify import markdownify
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / 'articles'))
+
+import medium_export  # noqa: E402
+
+WORDS = ("preference elicitation ranking utility voter model learning choice data "
+         "feature selection constraint solver integer program objective relaxation "
+         "pairwise comparison aggregation robust ordinal regression bayesian prior").split()
+WIDTHS = (640, 720, 750, 786, 828, 1100, 1400)
+
+# name -> (paragraphs, figures, code blocks)
+SIZES = {'short': (20, 3, 1), 'typical': (80, 10, 4), 'long': (220, 28, 10)}
+
+
+def _words(rng, n):
+    return ' '.join(rng.choice(WORDS) for _ in range(n))
+
+
+def _figure(rng, n):
+    image = f"1*{''.join(rng.choice('abcdefghijkLMNOPQ0123456789') for _ in range(22))}.png"
+    sources = []
+    for fmt, kind in (('format:webp/', ' type="image/webp"'), ('', '')):
+        srcset = ', '.join(f"https://miro.medium.com/v2/resize:fit:{w}/{fmt}{image} {w}w" for w in WIDTHS)
+        sources.append(f'<source srcset="{srcset}" sizes="(min-resolution: 4dppx) and (max-width: 700px) 80vw, '
+                       f'(-webkit-min-device-pixel-ratio: 4) and (max-width: 700px) 80vw, 700px"'
+                       f'{kind}/>')
+    return (f'<figure class="mq mr ms mt mu mv mn mo paragraph-image"><div role="button" tabindex="0" '
+            f'class="mw mx fj my bh mz"><span class="fp fq fr ai na nb nc nd"><div class="mn mo mp">'
+            f'<picture>{"".join(sources)}<img alt="" class="bh ne nf c" width="700" height="{rng.randint(300, 500)}" '
+            f'loading="{"eager" if n == 0 else "lazy"}" role="presentation"/></picture></div></span></div>'
+            f'<figcaption class="ng nh ni mn mo nj nk be b bf z dt" data-selectable-paragraph="">'
+            f'{_words(rng, 8).capitalize()}</figcaption></figure>')
+
+
+def _code(rng):
+    lines = []
+    for k in range(rng.randint(4, 14)):
+        lines.append(f'<span class="hljs-keyword">def</span> <span class="hljs-title function_">solve_{k}</span>'
+                     f'(<span class="hljs-params">model, x_{k}</span>): <span class="hljs-keyword">return</span> '
+                     f'model.fit(x_{k}, tol=<span class="hljs-number">1e-{k % 6 + 2}</span>)')
+    return (f'<pre class="oh oi oj ok ol om on oo op aw oq bj"><span id="{rng.getrandbits(16):x}" class="or ic gt on b '
+            f'bf os ot l ou ov" data-code-block-mode="2" spellcheck="false" data-code-block-lang="python">'
+            f'<code class="language-python hljs">{"<br/>".join(lines)}</code></span></pre>')
+
+
+def _paragraph(rng):
+    sentence = _words(rng, rng.randint(20, 60)).capitalize()
+    words = sentence.split(' ')
+    words.insert(rng.randrange(len(words)), f'<a class="af oc" href="https://example.org/{rng.choice(WORDS)}" '
+                                            f'rel="noopener ugc nofollow" target="_blank">{rng.choice(WORDS)}</a>')
+    words.insert(rng.randrange(len(words)), f'<strong class="nm fs">{_words(rng, 2)}</strong>')
+    words.insert(rng.randrange(len(words)), f'<code class="cx od oe of og b">x_{rng.randint(1, 9)}</code>')
+    return (f'<p id="{rng.getrandbits(16):x}" class="pw-post-body-paragraph nl nm gt nn b no np nq nr ns nt nu nv nw '
+            f'nx ny nz oa ob" data-selectable-paragraph="">{" ".join(words)}.</p>')
+
+
+def medium_page(rng, paragraphs, figures, code_blocks):
+    """A page shaped like a Medium article (2024 markup)."""
+    title = _words(rng, rng.randint(5, 10)).title()
+    state = {f'Paragraph:{rng.getrandbits(32):x}': {'text': _words(rng, 30), 'markups': [], 'type': 'P'}
+             for _ in range(paragraphs * 3)}
+    css = ''.join(f'.{a}{b}{{margin:{rng.randint(0, 40)}px;color:#{rng.getrandbits(24):06x}}}'
+                  for a in 'abcdefghijklmnopqrstuvwxyz' for b in 'abcdefghijklmnopqrstuvwxyz')
+    body = []
+    inserts = ['figure'] * (figures - 1) + ['code'] * code_blocks
+    every = max(1, paragraphs // (len(inserts) + 1))
+    for i in range(paragraphs):
+        if i % 15 == 14:
+            body.append(f'<h2 class="pa pb gt be pc pd pe pf pg ph pi pj pk pl pm pn">{_words(rng, 4).title()}</h2>')
+        body.append(_paragraph(rng))
+        if inserts and i % every == every - 1:
+            body.append(_figure(rng, i + 1) if inserts.pop(0) == 'figure' else _code(rng))
+    date = f"{rng.choice(['Jan', 'Mar', 'Jun', 'Sep', 'Nov'])} {rng.randint(1, 28)}, {rng.randint(2019, 2025)}"
+    return f'''<!doctype html><html lang="en"><head><title>{title} | by Author | Medium</title>
+<meta charset="utf-8"/><meta name="viewport" content="width=device-width,initial-scale=1"/>
+<meta property="og:title" content="{title}"/><meta name="title" content="{title} | by Author | Medium"/>
+<meta name="description" content="{_words(rng, 20)}"/>
+{''.join(f'<link rel="preload" href="https://cdn-client.medium.com/lite/static/js/{k}.{rng.getrandbits(32):x}.js" as="script"/>' for k in range(24))}
+<style type="text/css" data-fela-rehydration="{rng.randint(400, 600)}">{css}</style>
+<script>window.__BUILD_ID__="main-{rng.getrandbits(32):x}"</script>
+<script>window.__APOLLO_STATE__ = {json.dumps(state)}</script></head>
+<body><div id="root"><div class="a b c"><div class="l c"><nav class="fi fj fk">{''.join(f'<a href="/tag/{w}">{w}</a>' for w in WORDS[:12])}</nav>
+<article><div class="l"><div class="l"><span class="l"></span><section><div><div class="fr fs ft fu fv"></div>
+<div class="ab ca"><div class="ch bg ew ex ey ez"><div>
+<h1 id="{rng.getrandbits(16):x}" class="pw-post-title gs gt gu be gv gw gx gy gz ha hb" data-testid="storyTitle">{title}</h1>
+<h2 class="pw-subtitle-paragraph hm gt gu be b" data-selectable-paragraph="">{_words(rng, 14).capitalize()}</h2>
+<div class="speechify-ignore ab cp"><div class="speechify-ignore bh l"><div class="in io ip iq ir ab">
+<div class="pw-post-meta"><a href="/@author"><img alt="Author" class="l ep by dd de cx" src="https://miro.medium.com/v2/resize:fill:88:88/1*author.jpeg" width="44" height="44"/></a>
+<span data-testid="authorName">Author</span><span data-testid="storyReadTime">{paragraphs // 6} min read</span>·<span data-testid="storyPublishDate">{date}</span></div>
+<div class="pw-multi-vote-count clapButton"><button aria-label="clap">{rng.randint(10, 999)}</button></div>
+<div data-testid="postActionsBar"><button>Listen</button><button>Share</button></div></div></div></div>
+{_figure(rng, 0)}
+{''.join(body)}
+</div></div></div></div></section></div></div></article>
+<footer class="ab"><div data-testid="socialStats">{rng.randint(1, 99)} responses</div><p>{_words(rng, 12)}</p></footer>
+<aside>{''.join(f'<a href="/more/{k}">{_words(rng, 6)}</a>' for k in range(20))}</aside>
+</div></div></div></body></html>'''
+
+
+# ---------------------------------------------------------------------------
+# The pipeline before the single pass, for comparison
+# ---------------------------------------------------------------------------
+
+def _legacy_image_url(fig):
+    source_tags = fig.find_all("source")
+    img_url = None
+    if source_tags:
+        max_width = 0
+        for src in source_tags:
+            srcset = src.get("srcset", "")
+            if not srcset:
+                continue
+            for item in srcset.split(","):
+                parts = item.strip().split(" ")
+                if len(parts) == 2:
+                    url, w = parts
+                    try:
+                        w_val = int(re.sub("[^0-9]", "", w))
+                        if w_val > max_width:
+                            max_width = w_val
+                            img_url = url
+                    except ValueError:
+                        continue
+    if not img_url:
+        img_tag = fig.find("img")
+        if img_tag and img_tag.get("src"):
+            img_url = img_tag.get("src")
+    return img_url
+
+
+def legacy_markdown(html):
+    soup = BeautifulSoup(html, "html.parser")
+    article = soup.find("article")
+    h1 = soup.find("h1")
+    title = h1.text.strip() if h1 and h1.text.strip() else "Untitled"
+    description = ""
+    h1 = soup.find("h1")
+    if h1 and h1.find_next("h2"):
+        description = h1.find_next("h2").get_text(strip=True)
+    if not description and article.find("p"):
+        description = article.find("p").get_text(strip=True)
+    date = ""
+    date_match = re.search(r"\b([A-Z][a-z]{2,8} \d{1,2}, \d{4})\b", soup.get_text(" "))
+    if date_match:
+        date = datetime.strptime(date_match.group(1), "%b %d, %Y").strftime("%d/%m/%Y")
+
+    first_figure = article.find("figure")
+    if first_figure:
+        _legacy_image_url(first_figure)
+        first_figure.decompose()
+    for unwanted in article.select(
+        "header, footer, aside, div[class*='js-postShareWidget'], div[class*='clapButton'], div[class*='pw-post-meta'], div[data-testid='socialStats'], div[data-testid='postActionsBar']"
+    ):
+        unwanted.decompose()
+    for pre in article.find_all("pre"):
+        code_block = pre.get_text(strip=True)
+        lang_tag = ""
+        if pre.code and pre.code.has_attr("class"):
+            for c in pre.code["class"]:
+                if c.startswith("language-"):
+                    lang_tag = c.replace("language-", "")
+        pre.replace_with(f"\n```{lang_tag}\n{code_block}\n```\n")
+    for fig in article.find_all("figure"):
+        img_url = _legacy_image_url(fig)
+        if img_url:
+            local_name = medium_export.image_file_name(img_url)
+            fig.replace_with(f"\n![{local_name}]({local_name})\n")
+    for img in article.find_all("img"):
+        if img.get("src"):
+            local_name = medium_export.image_file_name(img["src"])
+            img.replace_with(f"\n![{local_name}]({local_name})\n")
+
+    markdown_text = markdownify(str(article))
+    markdown_text = re.sub(r"\n{3,}", "\n\n", markdown_text)
+    markdown_text = re.sub(r"\n\s*—+\s*\n", "\n\n", markdown_text)
+    markdown_text = medium_export.clean_markdown_metadata(markdown_text, title, description)
+    front_matter = f"---\ntitle: {title}\ndate: {date}\ndescription: {description}\n---\n"
+    return front_matter + "\n" + description + "\n\n---\n\n" + markdown_text
+
+
+def single_pass_markdown(html, parser):
+    medium_export.HTML_PARSER = parser
+    article, title, description, date, _, images = medium_export.prepare_article(html)
+    medium_export.link_images(images, {medium_export.image_file_name(url) for _, url in images})
+    return medium_export.article_markdown(article, title, description, date)
+
+
+def best_of(rounds, fn, html):
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        output = fn(html)
+        best = min(best, time.perf_counter() - start)
+    return best, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Medium export HTML -> Markdown benchmark.")
+    parser.add_argument('--fixtures', type=Path, help="benchmark the *.html pages in this folder instead")
+    parser.add_argument('--save', type=Path, help="write the synthetic pages to this folder and exit")
+    parser.add_argument('--rounds', type=int, default=5, help="runs per page and pipeline (default 5)")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        pages = {path.name: path.read_text(encoding='utf-8') for path in sorted(args.fixtures.glob('*.html'))}
+    else:
+        pages = {f'{name}.html': medium_page(random.Random(name), *shape) for name, shape in SIZES.items()}
+    if args.save:
+        args.save.mkdir(parents=True, exist_ok=True)
+        for name, html in pages.items():
+            (args.save / name).write_text(html, encoding='utf-8')
+        print(f"✓ Wrote {len(pages)} page(s) to {args.save}")
+        return
+
+    pipelines = {'legacy': legacy_markdown,
+                 'single-pass': lambda html: single_pass_markdown(html, 'html.parser')}
+    if medium_export.find_spec('lxml'):
+        pipelines['lxml'] = lambda html: single_pass_markdown(html, 'lxml')
+
+    print(f"{'page':<16}{'KB':>7}" + ''.join(f"{name + ' ms':>16}" for name in pipelines) + "  same output")
+    for name, html in pages.items():
+        times, outputs = [], []
+        for fn in pipelines.values():
+            seconds, output = best_of(args.rounds, fn, html)
+            times.append(seconds)
+            outputs.append(output)
+        same = all(output == outputs[0] for output in outputs[1:])
+        print(f"{name:<16}{len(html.encode()) / 1024:>7.0f}"
+              + ''.join(f"{seconds * 1e3:>16.1f}" for seconds in times)
+              + f"  {'yes' if same else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Placeholder restoration: chained str.replace vs render.restore_placeholders.
+
+Builds a synthetic converted article with N inline formulas (plus a block
+formula every 20 and an embed every 200) and times both ways of putting the
+stashed math back. The chained version grows with N * document length, the
+single pass with document length only, so doubling N should roughly double
+the single-pass time and quadruple the chained one.
+
+    python benchmarks/bench_placeholders.py [N ...]     # default 1000 2000 4000 8000
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import render  # noqa: E402
+
+
+def synthetic_article(n_inline):
+    embeds, blocks, inlines, parts = [], [], [], []
+    for i in range(n_inline):
+        inlines.append(f"x_{{{i}}}^2 + \\alpha_{i}")
+        parts.append(f"<p>Term {{{{MATHINLINE_{i}}}}} bounds the objective of item {i}.</p>")
+        if i % 20 == 0:
+            blocks.append(f"\\sum_{{k=0}}^{{{i}}} w_k x_k \\le b")
+            parts.append(f"{{{{MATHBLOCK_{len(blocks) - 1}}}}}")
+        if i % 200 == 0:
+            embeds.append(f'<div class="embedded-html" id="embed-{len(embeds)}">widget {i}</div>')
+            parts.append(f"{{{{HTMLEMBED_{len(embeds) - 1}}}}}")
+    return "\n".join(parts), embeds, blocks, inlines
+
+
+def chained_replace(html, embeds, blocks, inlines):
+    for i, embed in enumerate(embeds):
+        html = html.replace(f"{{{{HTMLEMBED_{i}}}}}", embed)
+    for i, tex in enumerate(blocks):
+        html = html.replace(f"{{{{MATHBLOCK_{i}}}}}", f"$$\n{tex}\n$$")
+    for i, tex in enumerate(inlines):
+        html = html.replace(f"{{{{MATHINLINE_{i}}}}}", f"${tex}$")
+    return html
+
+
+def best_of(fn, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(sizes):
+    print(f"{'spans':>7} {'doc KB':>8} {'chained ms':>11} {'single ms':>10} {'speedup':>8}")
+    for n in sizes:
+        html, embeds, blocks, inlines = synthetic_article(n)
+        t_chain, expected = best_of(chained_replace, html, embeds, blocks, inlines)
+        t_single, got = best_of(render.restore_placeholders, html, embeds, blocks, inlines)
+        assert got == expected, "single-pass output differs from chained replace"
+        print(f"{n:>7} {len(html) / 1024:>8.0f} {t_chain * 1e3:>11.1f} {t_single * 1e3:>10.2f} "
+              f"{t_chain / t_single:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main([int(a) for a in sys.argv[1:]] or [1000, 2000, 4000, 8000])
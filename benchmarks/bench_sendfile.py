@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Static file throughput of serve.py: Python-buffer copies vs sendfile.
+
+Writes files of a few sizes (resume.pdf is ~720 KB, et-book.ttf ~60 KB, a
+screen recording easily 50 MB) to a temp directory, serves it with
+
+    copy     the old path: read 64 KiB chunks into Python, write them out
+    sendfile serve.Handler (os.sendfile via socket.sendfile)
+    async    serve.py --async (loop.sendfile)
+
+on loopback, and fetches each file repeatedly. Reported is the best MB/s
+over the rounds, plus the CPU time the process spent per MB. Also checks
+that a Range request comes back as the right 206 slice.
+
+    python benchmarks/bench_sendfile.py [MB ...]     # default 0.7 8 64
+"""
+
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import serve  # noqa: E402
+
+CHUNK = 64 * 1024
+ROUNDS = 5
+
+
+class CopyingHandler(serve.Handler):
+    """serve.Handler before sendfile: every byte goes through a Python buffer."""
+
+    def _send_file(self, f, offset, count):
+        f.seek(offset)
+        while count > 0:
+            chunk = f.read(min(CHUNK, count))
+            if not chunk:
+                break
+            self.wfile.write(chunk)
+            count -= len(chunk)
+
+
+def start_threaded(handler):
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd.server_address[1]
+
+
+def start_async():
+    ready = threading.Event()
+    port = []
+
+    async def run():
+        listener = await asyncio.start_server(serve.AsyncServer().handle, '127.0.0.1', 0)
+        port.append(listener.sockets[0].getsockname()[1])
+        ready.set()
+        await listener.serve_forever()
+
+    threading.Thread(target=asyncio.run, args=(run(),), daemon=True).start()
+    ready.wait()
+    return port[0]
+
+
+def fetch(port, path, extra=''):
+    """(head, body) of one GET; Connection: close, so the body ends at EOF."""
+    with socket.create_connection(('127.0.0.1', port)) as s:
+        s.sendall(f'GET {path} HTTP/1.1\r\nHost: bench\r\nConnection: close\r\n{extra}\r\n'.encode())
+        chunks = []
+        while chunk := s.recv(1 << 20):
+            chunks.append(chunk)
+    head, _, body = b''.join(chunks).partition(b'\r\n\r\n')
+    return head, body
+
+
+def drain(port, path):
+    """Bytes received for one GET, headers included, without keeping them:
+    the client should cost as little as possible next to the server."""
+    received, buf = 0, bytearray(1 << 20)
+    with socket.create_connection(('127.0.0.1', port)) as s:
+        s.sendall(f'GET {path} HTTP/1.1\r\nHost: bench\r\nConnection: close\r\n\r\n'.encode())
+        while n := s.recv_into(buf):
+            received += n
+    return received
+
+
+def measure(port, path, size):
+    best, cpu = 0.0, float('inf')
+    for _ in range(ROUNDS):
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        received = drain(port, path)
+        wall, used = time.perf_counter() - start_wall, time.process_time() - start_cpu
+        assert received > size, f"got {received} bytes for a {size}-byte file"
+        best = max(best, size / wall / 1e6)
+        cpu = min(cpu, used / (size / 1e6))
+    return best, cpu
+
+
+def main(sizes_mb):
+    with tempfile.TemporaryDirectory(prefix='serve-bench-') as tmp:
+        os.chdir(tmp)
+        files = []
+        for mb in sizes_mb:
+            name = f'blob-{mb}MB.mp4'
+            Path(name).write_bytes(os.urandom(int(mb * 1e6)))
+            files.append((f'/{name}', int(mb * 1e6)))
+
+        servers = {'copy': start_threaded(CopyingHandler), 'sendfile': start_threaded(serve.Handler),
+                   'async': start_async()}
+
+        path, size = files[0]
+        expected = Path(path[1:]).read_bytes()[size // 3:size // 3 + 1000]
+        for port in servers.values():
+            head, body = fetch(port, path, f'Range: bytes={size // 3}-{size // 3 + 999}\r\n')
+            assert b' 206 ' in head.split(b'\r\n', 1)[0] and body == expected, "bad Range reply"
+
+        print(f"{'file MB':>8} {'server':>9} {'MB/s':>9} {'cpu ms/MB':>10}")
+        for path, size in files:
+            for name, port in servers.items():
+                rate, cpu = measure(port, path, size)
+                print(f"{size / 1e6:>8.1f} {name:>9} {rate:>9.0f} {cpu * 1e3:>10.2f}")
+
+
+if __name__ == '__main__':
+    main([float(a) for a in sys.argv[1:]] or [0.7, 8, 64])
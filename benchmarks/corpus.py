@@ -0,0 +1,141 @@
+"""Synthetic site corpora for the build benchmarks.
+
+write_site() lays out a throwaway copy of the site (templates, font, and
+`articles/<slug>/` folders) whose articles vary in length, math density,
+code blocks, :::html embeds and figures, the way the real ones do. write_deck()
+does the same for one reveal.js deck. Everything is seeded, so two runs
+benchmark the same bytes.
+"""
+
+import random
+import shutil
+from pathlib import Path
+
+from PIL import Image
+
+REPO = Path(__file__).resolve().parent.parent
+SITE_FILES = ('article_template.html', 'index_template.html', 'presentation_template.html', 'et-book.ttf')
+
+WORDS = ("preference elicitation ranking utility voter model learning choice data "
+         "feature selection constraint solver integer program objective relaxation "
+         "pairwise comparison aggregation robust ordinal regression bayesian prior "
+         "posterior sample optimal polytope dominance criterion weight").split()
+
+# (inline formulas per sentence, code blocks, embeds, figures) per article style.
+STYLES = {
+    'prose': (0.0, 0, 0, 1),
+    'math': (0.8, 0, 0, 2),
+    'code': (0.1, 6, 0, 2),
+    'widgets': (0.2, 1, 2, 4),
+}
+
+
+def _sentence(rng, math_density):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 20))]
+    if rng.random() < math_density:
+        words.insert(rng.randrange(len(words)), f"$x_{{{rng.randint(1, 9)}}} \\le \\sum_i w_i y_i$")
+    return ' '.join(words).capitalize() + '.'
+
+
+def _widget_html(rng, points=400):
+    """A Plotly-style embed: a div plus a script carrying a JSON payload."""
+    xs = ','.join(f'{rng.random():.4f}' for _ in range(points))
+    ys = ','.join(f'{rng.random():.4f}' for _ in range(points))
+    return (f'<div id="plot"></div>\n<script>\nvar data = [{{"x": [{xs}], "y": [{ys}], '
+            f'"type": "scatter"}}];\ndocument.getElementById("plot").dataset.n = data.length;\n</script>\n')
+
+
+def article_markdown(rng, title, paragraphs, style):
+    math_density, code_blocks, embeds, figures = STYLES[style]
+    description = _sentence(rng, 0)
+    parts = [f"---\ntitle: {title}\ndate: {rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/"
+             f"{rng.randint(2019, 2025)}\ndescription: {description}\n---\n"]
+    inserts = (['code'] * code_blocks + ['embed'] * embeds + ['figure'] * figures)
+    every = max(1, paragraphs // (len(inserts) + 1))
+    for i in range(paragraphs):
+        if i % 12 == 0:
+            parts.append(f"## {_sentence(rng, 0)[:40]}\n")
+        parts.append(' '.join(_sentence(rng, math_density) for _ in range(rng.randint(3, 6))) + '\n')
+        if math_density and i % 10 == 5:
+            parts.append("$$\n\\max_{x \\in \\{0,1\\}^n} \\sum_{i=1}^n c_i x_i \\quad "
+                         "\\text{s.t.} \\quad Ax \\le b\n$$\n")
+        if inserts and i % every == every - 1:
+            kind = inserts.pop(0)
+            n = len(inserts)
+            if kind == 'code':
+                parts.append("```python\n" + '\n'.join(
+                    f"weights[{k}] = solve(model, x_{k}, tol=1e-{k % 6 + 2})" for k in range(12)) + "\n```\n")
+            elif kind == 'embed':
+                parts.append(f":::html widget_{n}.html :::\n")
+            else:
+                parts.append(f"![Figure {n}](fig_{n}.png)\n")
+    return '\n'.join(parts)
+
+
+def _png(path, size, rng):
+    Image.new('RGB', size, tuple(rng.randrange(256) for _ in range(3))).save(path)
+
+
+def copy_site_files(root):
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    for name in SITE_FILES:
+        shutil.copy(REPO / name, root / name)
+    return root
+
+
+def write_article(root, slug, rng, paragraphs=40, style=None):
+    style = style or rng.choice(list(STYLES))
+    folder = Path(root) / 'articles' / slug
+    folder.mkdir(parents=True, exist_ok=True)
+    title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 11))).title()
+    (folder / 'article.md').write_text(article_markdown(rng, title, paragraphs, style), encoding='utf-8')
+    _, _, embeds, figures = STYLES[style]
+    for n in range(embeds):
+        (folder / f'widget_{n}.html').write_text(_widget_html(rng), encoding='utf-8')
+    for n in range(figures):
+        _png(folder / f'fig_{n}.png', (64, 48), rng)
+    if rng.random() < 0.5:
+        _png(folder / 'thumbnail.png', (800, 450), rng)
+    return folder / 'article.md'
+
+
+def write_site(root, articles, seed=0, paragraphs=(10, 80)):
+    """A site with `articles` articles of mixed styles and lengths."""
+    rng = random.Random(seed)
+    root = copy_site_files(root)
+    for i in range(articles):
+        write_article(root, f'article-{i:04d}', rng, paragraphs=rng.randint(*paragraphs))
+    return root
+
+
+def slide_markdown(rng, slides):
+    parts = ["---\ntitle: Synthetic Deck\n---\n"]
+    for i in range(slides):
+        kind = i % 5
+        body = [f"## {_sentence(rng, 0)[:36]}"]
+        if kind == 0:
+            body += [f"- {_sentence(rng, 0.6)}" for _ in range(4)]
+        elif kind == 1:
+            body.append("$$\n\\mathbb{E}[u(x)] = \\int_\\Theta u(x, \\theta)\\, p(\\theta \\mid D)\\, d\\theta\n$$")
+        elif kind == 2:
+            body.append(":::html widget.html :::")
+        elif kind == 3:
+            body.append("```python\nmodel = fit(prefs, prior=prior)\nprint(model.rank(items))\n```")
+        else:
+            body.append(f'<!-- .slide: data-background="#f{i % 10}f{i % 10}f{i % 10}" -->\n{_sentence(rng, 0.3)}')
+        body.append(f"Note:\n{_sentence(rng, 0.2)}")
+        sep = "\n--\n" if i % 7 == 6 else "\n---\n"
+        parts.append('\n\n'.join(body) + '\n' + (sep if i < slides - 1 else ''))
+    return ''.join(parts)
+
+
+def write_deck(root, slides, seed=0, name='synthetic-deck'):
+    """presentations/<name>/slides.md with `slides` slides (math, notes, embeds, code)."""
+    rng = random.Random(seed)
+    root = copy_site_files(root)
+    folder = root / 'presentations' / name
+    folder.mkdir(parents=True, exist_ok=True)
+    (folder / 'slides.md').write_text(slide_markdown(rng, slides), encoding='utf-8')
+    (folder / 'widget.html').write_text(_widget_html(rng, points=100), encoding='utf-8')
+    return folder / 'slides.md'
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Benchmarks for the site build pipeline.
+
+Each case builds a synthetic corpus (see corpus.py) in a temp directory and
+times one entry point of generate.py at several sizes:
+
+    generate_all_articles   cold (--force) and warm (manifest hit) builds of 10 / 100 / 1000 articles
+    generate_all_presentations   one deck of 10 / 100 / 1000 slides
+    convert_md_to_html      one article of 10 / 100 / 1000 paragraphs
+    _render_slide_body      10 / 100 / 1000 slide bodies
+    generate_og_thumbnail   10 cards
+
+Every case runs in a fresh process, so its peak RSS is its own. Results are
+appended to a JSON history (benchmarks/history.json by default) and compared
+with the previous run from the same machine; with --check, a case that got
+slower than --threshold makes the script exit 1.
+
+    python benchmarks/run.py                 # everything
+    python benchmarks/run.py --quick         # skip the 1000-sized cases
+    python benchmarks/run.py --only generate_all_articles --check
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+sys.path.insert(0, str(HERE))
+
+import corpus  # noqa: E402
+
+HISTORY = HERE / 'history.json'
+
+# case -> (sizes, unit counted for throughput)
+CASES = {
+    'generate_all_articles:cold': ((10, 100, 1000), 'articles'),
+    'generate_all_articles:warm': ((10, 100, 1000), 'articles'),
+    'generate_all_presentations': ((10, 100, 1000), 'slides'),
+    'convert_md_to_html': ((10, 100, 1000), 'paragraphs'),
+    '_render_slide_body': ((10, 100, 1000), 'slides'),
+    'generate_og_thumbnail': ((10,), 'cards'),
+}
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def _bench(case, size):
+    """Set up the corpus for case in the cwd and return the timed callable."""
+    import generate
+    import og
+
+    if case.startswith('generate_all_articles'):
+        corpus.write_site('.', articles=size)
+        if case.endswith(':warm'):
+            generate.generate_all_articles()
+            return lambda: generate.generate_all_articles()
+        return lambda: generate.generate_all_articles(force=True)
+
+    if case == 'generate_all_presentations':
+        corpus.write_deck('.', slides=size)
+        return lambda: generate.generate_all_presentations()
+
+    if case == 'convert_md_to_html':
+        corpus.copy_site_files('.')
+        md_file = corpus.write_article('.', 'long-article', random.Random(0), paragraphs=size, style='widgets')
+        generate.convert_md_to_html(md_file, output_file=md_file.parent / 'index.html')  # draws og.png once
+        return lambda: generate.convert_md_to_html(md_file, output_file=md_file.parent / 'index.html')
+
+    if case == '_render_slide_body':
+        slides_md = corpus.write_deck('.', slides=size)
+        bodies = [b for b in corpus.slide_markdown(random.Random(0), size).split('\n---\n') if b.strip()]
+        return lambda: [generate._render_slide_body(body, slides_md.parent) for body in bodies]
+
+    if case == 'generate_og_thumbnail':
+        corpus.copy_site_files('.')
+        rng = random.Random(0)
+        corpus._png('background.png', (800, 450), rng)
+        titles = [' '.join(rng.choice(corpus.WORDS) for _ in range(rng.randint(4, 14))).title()
+                  for _ in range(size)]
+        return lambda: [og.generate_og_thumbnail(f'og-{i}.png', title, background_path='background.png')
+                        for i, title in enumerate(titles)]
+
+    raise ValueError(f"unknown case {case}")
+
+
+def run_case(case, size):
+    """Runs in a fresh worker process: build the corpus, time one call, report peak RSS."""
+    with tempfile.TemporaryDirectory(prefix='site-bench-') as tmp:
+        os.chdir(tmp)
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn = _bench(case, size)
+            start_wall, start_cpu = time.perf_counter(), time.process_time()
+            fn()
+            wall, cpu = time.perf_counter() - start_wall, time.process_time() - start_cpu
+    return {'case': case, 'size': size, 'seconds': wall, 'cpu_seconds': cpu,
+            'throughput': size / wall, 'unit': CASES[case][1], 'peak_rss_mb': _peak_rss_mb()}
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def previous_results(history, machine):
+    for run in reversed(history):
+        if run.get('machine') == machine:
+            return {(r['case'], r['size']): r for r in run['results']}
+    return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the site build pipeline.")
+    parser.add_argument('--only', nargs='+', choices=sorted(CASES), metavar='CASE', help="run just these cases")
+    parser.add_argument('--quick', action='store_true', help="skip the 1000-sized cases")
+    parser.add_argument('--history', default=HISTORY, type=Path, help=f"results file (default {HISTORY})")
+    parser.add_argument('--no-save', action='store_true', help="don't append this run to the history")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="slowdown vs the previous run that counts as a regression (default 0.2 = 20%%)")
+    parser.add_argument('--check', action='store_true', help="exit 1 if any case regressed")
+    args = parser.parse_args()
+
+    machine = f"{platform.node()} {platform.machine()} py{platform.python_version()}"
+    history = load_history(args.history)
+    previous = previous_results(history, machine)
+
+    results, regressions = [], []
+    print(f"{'case':<30}{'size':>6}{'seconds':>10}{'throughput':>26}{'peak RSS':>11}{'vs last':>9}")
+    for case in args.only or CASES:
+        sizes, _ = CASES[case]
+        for size in sizes:
+            if args.quick and size >= 1000:
+                continue
+            # spawn, not fork: the child must not inherit this process's RSS.
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+                result = pool.submit(run_case, case, size).result()
+            results.append(result)
+
+            delta = ''
+            before = previous.get((case, size))
+            if before:
+                change = result['seconds'] / before['seconds'] - 1
+                delta = f"{change:+.0%}"
+                if change > args.threshold:
+                    regressions.append((case, size, change))
+                    delta += ' !'
+            print(f"{case:<30}{size:>6}{result['seconds']:>10.3f}"
+                  f"{result['throughput']:>12.1f} {result['unit'] + '/s':<13}"
+                  f"{result['peak_rss_mb']:>8.0f} MB{delta:>9}")
+
+    if not args.no_save:
+        history.append({'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                        'revision': _git_revision(), 'machine': machine, 'results': results})
+        with open(args.history, 'w', encoding='utf-8') as f:
+            json.dump(history, f, indent=1)
+        print(f"\n✓ Results appended to {args.history}")
+
+    if regressions:
+        print(f"\n⚠️  {len(regressions)} case(s) slower than the previous run by more than {args.threshold:.0%}:")
+        for case, size, change in regressions:
+            print(f"   {case} @ {size}: {change:+.0%}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
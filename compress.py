@@ -0,0 +1,126 @@
+"""Precompressed .gz / .br sidecars for the site's text assets.
+
+After a build, every text asset above MIN_SIZE (pages, style.css, site.js,
+widgets like moment_plane.html with their inline JSON, the ET Book font) gets
+a gzip sibling, plus a brotli one when the optional `brotli` package is
+installed. serve.py hands these out as-is to clients whose Accept-Encoding
+allows it, so nothing is compressed per request.
+
+The sha256 of each source is remembered (generate.py keeps it in its build
+manifest), so unchanged files are not recompressed; sidecars of files that
+vanished or shrank below the threshold are removed.
+
+    python generate.py --compress   # build, then compress
+    python compress.py              # compress the current tree only
+"""
+
+import gzip
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # optional: gzip sidecars only
+    brotli = None
+
+# Only what the site serves: Markdown and BibTeX sources are build inputs, and so
+# are the *_template.html pages generate.py fills in.
+COMPRESSIBLE = {'.html', '.css', '.js', '.mjs', '.json', '.svg', '.xml', '.txt', '.ttf'}
+MIN_SIZE = 1024
+SKIP_DIRS = {'venv', 'node_modules', '__pycache__', 'benchmarks'}
+TEMPLATE_SUFFIX = '_template.html'
+
+# (Content-Encoding, suffix, compress). gzip mtime=0 keeps the bytes reproducible.
+ENCODERS = [('gzip', '.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+if brotli is not None:
+    ENCODERS.insert(0, ('br', '.br', lambda data: brotli.compress(data, quality=11)))
+
+
+def _write_bytes(path, data):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def sidecar_paths(path):
+    path = Path(path)
+    return [path.with_name(path.name + suffix) for _, suffix, _ in ENCODERS]
+
+
+def candidates(root='.', min_size=MIN_SIZE):
+    """Served text assets under root worth compressing, as paths relative to root."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.') and d not in SKIP_DIRS)
+        for name in sorted(filenames):
+            path = Path(dirpath) / name
+            if (not name.startswith('.') and not name.endswith(TEMPLATE_SUFFIX)
+                    and path.suffix.lower() in COMPRESSIBLE and path.stat().st_size >= min_size):
+                yield path.relative_to(root).as_posix()
+
+
+def refresh(path, known_digest=None):
+    """(sha256, recompressed?) for one asset; its sidecars are rewritten only if it changed.
+
+    serve.py ignores a sidecar older than its source, so if the source was
+    touched without changing (a checkout, a copy, a restored backup), its
+    sidecars just get their mtime bumped instead.
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    sidecars = sidecar_paths(path)
+    if digest == known_digest and all(p.exists() for p in sidecars):
+        source_mtime = path.stat().st_mtime_ns
+        for sidecar in sidecars:
+            if sidecar.stat().st_mtime_ns < source_mtime:
+                os.utime(sidecar, ns=(source_mtime, source_mtime))
+        return digest, False
+    for (_, suffix, encode), sidecar in zip(ENCODERS, sidecar_paths(path)):
+        _write_bytes(sidecar, encode(data))
+    return digest, True
+
+
+def remove_sidecars(path):
+    for name in ('.gz', '.br'):
+        Path(str(path) + name).unlink(missing_ok=True)
+
+
+def compress_site(root='.', state=None, min_size=MIN_SIZE, workers=None):
+    """Bring every sidecar under root up to date; state maps relpath -> sha256
+    and is updated in place. Returns (recompressed, unchanged)."""
+    state = {} if state is None else state
+    root = Path(root)
+    found = list(candidates(root, min_size))
+
+    for gone in set(state) - set(found):
+        remove_sidecars(root / gone)
+        del state[gone]
+
+    # zlib and brotli release the GIL, so threads compress in parallel.
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda rel: refresh(root / rel, state.get(rel)), found))
+
+    written = 0
+    for rel, (digest, changed) in zip(found, results):
+        state[rel] = digest
+        written += changed
+    print(f"✓ Compressed {written} asset(s) ({len(found) - written} unchanged, "
+          f"{' + '.join(name for name, _, _ in ENCODERS)})")
+    return written, len(found) - written
+
+
+if __name__ == '__main__':
+    import generate
+
+    manifest = generate.load_manifest()
+    compress_site('.', manifest.setdefault('compressed', {}))
+    generate.save_manifest(manifest)
@@ -1,14 +1,19 @@
-import markdown
-import re
 from pathlib import Path
 import os
+import json
+import hashlib
 import readtime
 from datetime import datetime
 import time
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
-from PIL import Image, ImageDraw, ImageFont
+import compress
+import og
+import render
+import timings
 
 def parse_date(date_str):
     try:
@@ -27,56 +32,6 @@ def format_date_display(date_str):
     except:
         return date_str
 
-def generate_og_thumbnail(output_path, title, background_path=None, width=1200, height=630, font_path=None):
-    if background_path and Path(background_path).exists():
-        bg = Image.open(background_path).convert("RGB")
-        bg = bg.resize((width, height))
-        img = bg
-    else:
-        img = Image.new('RGB', (width, height), color=(40, 40, 40))
-
-    draw = ImageDraw.Draw(img)
-
-    overlay = Image.new('RGBA', (width, height), (0, 0, 0, 150))
-    img = Image.alpha_composite(img.convert('RGBA'), overlay)
-
-    if font_path is None:
-        font_path = "et-book.ttf"
-    try:
-        font_size = 80
-        font = ImageFont.truetype(font_path, font_size)
-    except:
-        font = ImageFont.load_default()
-
-    words = title.split()
-    lines = []
-    current_line = ""
-    for word in words:
-        test_line = current_line + (" " if current_line else "") + word
-        bbox = draw.textbbox((0, 0), test_line, font=font)
-        text_width = bbox[2] - bbox[0]
-        if text_width <= width - 100:
-            current_line = test_line
-        else:
-            lines.append(current_line)
-            current_line = word
-    lines.append(current_line)
-
-    total_text_height = sum(draw.textbbox((0, 0), line, font=font)[3] - draw.textbbox((0, 0), line, font=font)[1] for line in lines)
-    y_text = (height - total_text_height) // 2
-
-    draw = ImageDraw.Draw(img)
-    for line in lines:
-        bbox = draw.textbbox((0, 0), line, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        x_text = (width - text_width) // 2
-        draw.text((x_text, y_text), line, font=font, fill=(255, 255, 255))
-        y_text += text_height
-
-    img.convert('RGB').save(output_path)
-    return output_path
-
 def isolate_html_scripts(html_content):
     def wrap_script(match):
         opening_tag = match.group(1)
@@ -93,17 +48,17 @@ def isolate_html_scripts(html_content):
 
         return f"{opening_tag}{wrapped_content}{closing_tag}"
 
-    pattern = r'(<script[^>]*>)(.*?)(</script>)'
-    isolated_html = re.sub(pattern, wrap_script, html_content, flags=re.DOTALL | re.IGNORECASE)
+    isolated_html = render.SCRIPT_RE.sub(wrap_script, html_content)
 
     return isolated_html
 
+@timings.timed('article')
 def convert_md_to_html(md_file, output_file=None, template_file='article_template.html'):
+    lap = timings.laps(md_file)
     with open(md_file, 'r', encoding='utf-8') as f:
         content = f.read()
 
-    frontmatter_pattern = r'^---\s*\n(.*?)\n---\s*\n'
-    frontmatter_match = re.search(frontmatter_pattern, content, re.DOTALL)
+    frontmatter_match = render.FRONTMATTER_RE.search(content)
 
     title = "Untitled Article"
     date = "No date"
@@ -115,30 +70,30 @@ def convert_md_to_html(md_file, output_file=None, template_file='article_templat
         frontmatter = frontmatter_match.group(1)
         content = content[frontmatter_match.end():]
 
-        title_match = re.search(r'title:\s*(.+)', frontmatter)
+        title_match = render.FRONTMATTER_FIELD_RE['title'].search(frontmatter)
         if title_match:
             title = title_match.group(1).strip()
 
-        date_match = re.search(r'date:\s*(.+)', frontmatter)
+        date_match = render.FRONTMATTER_FIELD_RE['date'].search(frontmatter)
         if date_match:
             date = date_match.group(1).strip()
 
-        description_match = re.search(r'description:\s*(.+)', frontmatter)
+        description_match = render.FRONTMATTER_FIELD_RE['description'].search(frontmatter)
         if description_match:
             description = description_match.group(1).strip()
 
-        thumbnail_match = re.search(r'thumbnail:\s*(.+)', frontmatter)
+        thumbnail_match = render.FRONTMATTER_FIELD_RE['thumbnail'].search(frontmatter)
         if thumbnail_match:
             thumbnail = thumbnail_match.group(1).strip()
 
         # Canonical Medium / Towards Data Science URL: when present, the homepage
         # card links out to Medium instead of the local mirror.
-        medium_match = re.search(r'medium:\s*(.+)', frontmatter)
+        medium_match = render.FRONTMATTER_FIELD_RE['medium'].search(frontmatter)
         if medium_match:
             medium = medium_match.group(1).strip()
 
         is_draft = False
-        draft_match = re.search(r'draft:\s*(true|false)', frontmatter, re.IGNORECASE)
+        draft_match = render.DRAFT_RE.search(frontmatter)
         if draft_match:
             is_draft = draft_match.group(1).lower() == 'true'
 
@@ -157,6 +112,7 @@ def convert_md_to_html(md_file, output_file=None, template_file='article_templat
             if _k < len(_lines) and _lines[_k].strip() in ('---', '***', '___'):
                 _k += 1
             content = '\n'.join(_lines[_k:])
+    lap('frontmatter')
 
     html_embed_store = []
 
@@ -181,7 +137,8 @@ def convert_md_to_html(md_file, output_file=None, template_file='article_templat
 
         return f"\n\n{{{{HTMLEMBED_{idx}}}}}\n\n"
 
-    content = re.sub(r':::html\s+(.+?)\s+:::', _stash_html_embed, content, flags=re.DOTALL)
+    content = render.HTML_EMBED_RE.sub(_stash_html_embed, content)
+    lap('embeds')
 
     block_store = []
     inline_store = []
@@ -196,34 +153,22 @@ def convert_md_to_html(md_file, output_file=None, template_file='article_templat
         inline_store.append(m.group(1))
         return f"{{{{MATHINLINE_{idx}}}}}"
 
-    content = re.sub(r'\$\$(.*?)\$\$', _stash_block, content, flags=re.DOTALL)
-    content = re.sub(r'(?<!\$)\$(?!\$)(.+?)(?<!\$)\$(?!\$)', _stash_inline, content, flags=re.DOTALL)
-
-    md = markdown.Markdown(
-        extensions=['extra', 'fenced_code', 'codehilite'],
-        extension_configs={
-            'codehilite': {'guess_lang': False, 'use_pygments': False}
-        }
-    )
-    article_content = md.convert(content)
-
-    for i, html_content in enumerate(html_embed_store):
-        article_content = article_content.replace(f"{{{{HTMLEMBED_{i}}}}}", html_content)
+    content = render.MATH_BLOCK_RE.sub(_stash_block, content)
+    content = render.MATH_INLINE_RE.sub(_stash_inline, content)
+    lap('math')
 
-    for i, tex in enumerate(block_store):
-        article_content = article_content.replace(f"{{{{MATHBLOCK_{i}}}}}", f"$$\n{tex}\n$$")
-    for i, tex in enumerate(inline_store):
-        article_content = article_content.replace(f"{{{{MATHINLINE_{i}}}}}", f"${tex}$")
+    article_content = render.markdown_to_html(content, 'article')
+    lap('markdown')
 
-    with open(template_file, 'r', encoding='utf-8') as f:
-        template = f.read()
-
-    html_output = template.replace('{{TITLE}}', title)
-    html_output = html_output.replace('{{DATE}}', format_date_display(date))
-    html_output = html_output.replace('{{CONTENT}}', article_content)
+    # Kept as a stream of pieces: the converted body and large embeds go to
+    # disk as they are, without ever being joined into one page string.
+    article_content = render.iter_placeholders(article_content, html_embed_store, block_store, inline_store)
 
     time_read = readtime.of_text(content)
-    html_output = html_output.replace('{{READ_TIME}}', str(time_read))
+    lap('readtime')
+
+    if output_file is None:
+        output_file = Path(md_file).parent / 'index.html'
 
     link_path = os.path.relpath(output_file, start=Path.cwd()).replace('\\', '/')
 
@@ -232,26 +177,30 @@ def convert_md_to_html(md_file, output_file=None, template_file='article_templat
         if local_thumb.exists():
             thumbnail = os.path.relpath(local_thumb, start=Path.cwd()).replace('\\', '/')
 
-    # og.png is a derived social-preview image. Regenerating it every build
-    # rewrites identical-looking bytes and dirties git, so only build it when
-    # missing. Delete the file to force a refresh (e.g. after a title change).
+    # og.png is a derived social-preview image. It is keyed on its title and
+    # background, so it is only redrawn (and only dirties git) when one of
+    # those actually changed.
     og_path = Path(md_file).parent / 'og.png'
-    if not og_path.exists():
-        bg_path = thumbnail if thumbnail else None
-        generate_og_thumbnail(og_path, title, background_path=bg_path)
-
-    html_output = html_output.replace('{{DESCRIPTION}}', description)
-    html_output = html_output.replace('{{SUBTITLE}}', description)
+    og.ensure_og_image(og_path, title, background_path=thumbnail or None)
+    lap('og')
 
     article_folder = Path(md_file).parent.name
     og_url = f"/articles/{article_folder}/og.png"
-    html_output = html_output.replace('{{OG}}', og_url)
-
-    if output_file is None:
-        output_file = Path(md_file).parent / 'index.html'
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_output)
+    template = render.load_template(template_file)
+    lap('template')
+    # Slots are filled (and placeholders restored) lazily, as the page is written.
+    page = template.segments(
+        TITLE=title,
+        DATE=format_date_display(date),
+        CONTENT=article_content,
+        READ_TIME=str(time_read),
+        DESCRIPTION=description,
+        SUBTITLE=description,
+        OG=og_url,
+    )
+    render.write_page(output_file, page)
+    lap('write')
 
     print()
     print(f"✓ Converted {md_file} to {output_file}")
@@ -289,6 +238,7 @@ def convert_md_to_html(md_file, output_file=None, template_file='article_templat
 
 def _render_slide_body(content, md_dir):
     """Convert one slide's Markdown to HTML, protecting math and HTML embeds."""
+    lap = timings.laps(md_dir)
     html_embed_store = []
 
     def _stash_html_embed(m):
@@ -304,7 +254,8 @@ def _render_slide_body(content, md_dir):
             html_embed_store.append(f'<p style="color: red;">Error: HTML file not found: {file_path}</p>')
         return f"\n\n{{{{HTMLEMBED_{idx}}}}}\n\n"
 
-    content = re.sub(r':::html\s+(.+?)\s+:::', _stash_html_embed, content, flags=re.DOTALL)
+    content = render.HTML_EMBED_RE.sub(_stash_html_embed, content)
+    lap('embeds')
 
     block_store, inline_store = [], []
 
@@ -316,31 +267,28 @@ def _render_slide_body(content, md_dir):
         inline_store.append(m.group(1))
         return f"{{{{MATHINLINE_{len(inline_store) - 1}}}}}"
 
-    content = re.sub(r'\$\$(.*?)\$\$', _stash_block, content, flags=re.DOTALL)
-    content = re.sub(r'(?<!\$)\$(?!\$)(.+?)(?<!\$)\$(?!\$)', _stash_inline, content, flags=re.DOTALL)
+    content = render.MATH_BLOCK_RE.sub(_stash_block, content)
+    content = render.MATH_INLINE_RE.sub(_stash_inline, content)
+    lap('math')
 
-    md = markdown.Markdown(extensions=['extra'])
-    html = md.convert(content)
+    html = render.markdown_to_html(content, 'slide')
+    lap('markdown')
 
-    for i, embed in enumerate(html_embed_store):
-        html = html.replace(f"{{{{HTMLEMBED_{i}}}}}", embed)
-    for i, tex in enumerate(block_store):
-        html = html.replace(f"{{{{MATHBLOCK_{i}}}}}", f"$$\n{tex}\n$$")
-    for i, tex in enumerate(inline_store):
-        html = html.replace(f"{{{{MATHINLINE_{i}}}}}", f"${tex}$")
+    html = render.restore_placeholders(html, html_embed_store, block_store, inline_store)
+    lap('restore')
     return html
 
 
 def _render_one_slide(raw, md_dir):
     """Turn one slide's raw Markdown into a <section> (with optional notes/attrs)."""
     attrs = ''
-    attr_match = re.search(r'<!--\s*\.slide:\s*(.*?)-->', raw, flags=re.DOTALL)
+    attr_match = render.SLIDE_ATTRS_RE.search(raw)
     if attr_match:
         attrs = ' ' + attr_match.group(1).strip()
         raw = raw.replace(attr_match.group(0), '')
 
     notes_html = ''
-    parts = re.split(r'(?m)^Note:[ \t]*$', raw, maxsplit=1)
+    parts = render.SLIDE_NOTES_RE.split(raw, maxsplit=1)
     body = parts[0]
     if len(parts) > 1 and parts[1].strip():
         notes_html = '\n<aside class="notes">\n' + _render_slide_body(parts[1].strip(), md_dir) + '\n</aside>'
@@ -349,24 +297,27 @@ def _render_one_slide(raw, md_dir):
     return f"<section{attrs}>\n{body_html}{notes_html}\n</section>"
 
 
+@timings.timed('deck')
 def convert_slides_to_html(md_file, output_file=None, template_file='presentation_template.html'):
+    lap = timings.laps(md_file)
     with open(md_file, 'r', encoding='utf-8') as f:
         content = f.read()
 
     md_dir = Path(md_file).parent
     title = md_dir.name.replace('-', ' ').replace('_', ' ').title()
 
-    frontmatter_match = re.search(r'^---\s*\n(.*?)\n---\s*\n', content, re.DOTALL)
+    frontmatter_match = render.FRONTMATTER_RE.search(content)
     if frontmatter_match:
         frontmatter = frontmatter_match.group(1)
         content = content[frontmatter_match.end():]
-        title_match = re.search(r'title:\s*(.+)', frontmatter)
+        title_match = render.FRONTMATTER_FIELD_RE['title'].search(frontmatter)
         if title_match:
             title = title_match.group(1).strip()
+    lap('frontmatter')
 
     sections = []
-    for h_slide in re.split(r'(?m)^---[ \t]*$', content):
-        verticals = [v for v in re.split(r'(?m)^--[ \t]*$', h_slide) if v.strip()]
+    for h_slide in render.SLIDE_SPLIT_RE.split(content):
+        verticals = [v for v in render.SUBSLIDE_SPLIT_RE.split(h_slide) if v.strip()]
         if not verticals:
             continue
         rendered = [_render_one_slide(v, md_dir) for v in verticals]
@@ -377,33 +328,134 @@ def convert_slides_to_html(md_file, output_file=None, template_file='presentatio
 
     slides_html = "\n\n".join(sections)
 
-    with open(template_file, 'r', encoding='utf-8') as f:
-        template = f.read()
-
-    html_output = template.replace('{{TITLE}}', title).replace('{{SLIDES}}', slides_html)
-
+    # Restart the stopwatch: the slides themselves were timed stage by stage.
+    lap = timings.laps(md_file)
     if output_file is None:
         output_file = md_dir / 'index.html'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_output)
+    template = render.load_template(template_file)
+    lap('template')
+    render.write_page(output_file, template.segments(TITLE=title, SLIDES=slides_html))
+    lap('write')
 
     print(f"✓ Built presentation: {output_file}  ({len(sections)} slides) — {title}")
     return {'title': title, 'link': os.path.relpath(output_file, start=Path.cwd()).replace('\\', '/')}
 
 
-def generate_all_presentations(presentations_dir='presentations', template='presentation_template.html'):
+def run_jobs(func, calls, jobs=1):
+    """Call func(*args, **kwargs) for each (args, kwargs) in calls.
+
+    With jobs > 1 (or 0 = one per CPU) the calls are spread over a process
+    pool. Results always come back in the order of calls, so whatever is built
+    from them (the homepage listing) does not depend on which worker finished
+    first.
+    """
+    if jobs == 1 or len(calls) < 2:
+        return [func(*args, **kwargs) for args, kwargs in calls]
+    with ProcessPoolExecutor(max_workers=jobs or None) as pool:
+        if not timings.enabled():
+            futures = [pool.submit(func, *args, **kwargs) for args, kwargs in calls]
+            return [future.result() for future in futures]
+        # Profiling: each worker ships its stage timings back with the result.
+        futures = [pool.submit(timings.call_traced, func, args, kwargs) for args, kwargs in calls]
+        return [timings.merge(*future.result()) for future in futures]
+
+
+def generate_all_presentations(presentations_dir='presentations', template='presentation_template.html', jobs=1):
     presentations_path = Path(presentations_dir)
     if not presentations_path.exists():
-        return
+        return []
+    calls = []
     for subdir in sorted(presentations_path.iterdir()):
         if not subdir.is_dir() or subdir.name.startswith('_'):
             continue
         slides_md = subdir / 'slides.md'
         if slides_md.exists():
-            convert_slides_to_html(slides_md, output_file=subdir / 'index.html', template_file=template)
+            calls.append(((slides_md,), {'output_file': subdir / 'index.html', 'template_file': template}))
+    return run_jobs(convert_slides_to_html, calls, jobs)
+
+
+# ---------------------------------------------------------------------------
+# Incremental builds
+#
+# BUILD_MANIFEST remembers, for every compiled article, a hash of everything
+# that went into its index.html (article.md, each :::html embed it pulls in,
+# the article template, the thumbnail, the build code and the og.png font) next to the
+# metadata convert_md_to_html returned. When the inputs hash the same as last
+# time the article is not recompiled and its homepage card comes from the
+# manifest. Delete the file (or run with --force) to rebuild everything.
+# ---------------------------------------------------------------------------
+
+BUILD_MANIFEST = '.build-manifest.json'
+
+
+def load_manifest(path=BUILD_MANIFEST):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
 
+def save_manifest(manifest, path=BUILD_MANIFEST):
+    # Atomic (temp file + rename): the watcher or a second build may be
+    # reading it right now, and a truncated manifest reads as empty.
+    render.write_page(path, [json.dumps(manifest, indent=1, sort_keys=True)])
 
-def generate_all_articles(articles_dir='articles', article_template='article_template.html', index_template='index_template.html', main_index='index.html'):
+
+def _hash_file(h, path):
+    try:
+        h.update(Path(path).read_bytes())
+    except OSError:
+        h.update(b'<missing>')
+    h.update(b'\0')
+
+
+def _embed_paths(md_file, text):
+    return [Path(md_file).parent / m.strip()
+            for m in render.HTML_EMBED_RE.findall(text)]
+
+
+def article_dependencies(md_file, template_file, text=None):
+    """Every file convert_md_to_html reads for this article, article.md first."""
+    md_file = Path(md_file)
+    if text is None:
+        text = md_file.read_text(encoding='utf-8')
+    # A frontmatter thumbnail (relative to the site root) wins over the local one.
+    thumb_match = render.THUMBNAIL_LINE_RE.search(text)
+    thumbnail = Path(thumb_match.group(1).strip()) if thumb_match else md_file.parent / 'thumbnail.png'
+    return [md_file, *_embed_paths(md_file, text), Path(template_file), thumbnail]
+
+
+def presentation_dependencies(slides_md, template_file):
+    """Every file convert_slides_to_html reads for this deck, slides.md first."""
+    slides_md = Path(slides_md)
+    text = slides_md.read_text(encoding='utf-8')
+    return [slides_md, *_embed_paths(slides_md, text), Path(template_file)]
+
+
+def build_code_hash():
+    """Hash of what every article's build shares: the build modules and the
+    og.png font. Computed once per build and folded into each article's hash."""
+    h = hashlib.sha256()
+    for path in (__file__, render.__file__, og.__file__, timings.__file__, og.DEFAULT_FONT):
+        _hash_file(h, path)
+    return h.hexdigest()
+
+
+def article_inputs_hash(md_file, template_file, code_hash=None):
+    """Hash of every input convert_md_to_html reads for this article."""
+    md_file = Path(md_file)
+    text = md_file.read_text(encoding='utf-8')
+    h = hashlib.sha256(text.encode('utf-8'))
+    h.update(b'\0')
+    for path in article_dependencies(md_file, template_file, text)[1:]:
+        _hash_file(h, path)
+    h.update((code_hash or build_code_hash()).encode('ascii'))
+    return h.hexdigest()
+
+
+def generate_all_articles(articles_dir='articles', article_template='article_template.html', index_template='index_template.html', main_index='index.html',
+                          force=False, jobs=1):
     articles_path = Path(articles_dir)
 
     if not articles_path.exists():
@@ -411,23 +463,63 @@ def generate_all_articles(articles_dir='articles', article_template='article_tem
         return
 
     articles_info = []
-
-    for article_subdir in articles_path.iterdir():
+    manifest = load_manifest()
+    cached = manifest.get('articles', {})
+    built = {}
+    unchanged = 0
+
+    # First pass: decide which articles are stale. Second pass: compile them
+    # (possibly in parallel) and merge the results back in folder order.
+    lap = timings.laps(articles_dir)
+    code_hash = build_code_hash()
+    found = []
+    stale = []
+    for article_subdir in sorted(articles_path.iterdir()):
         if article_subdir.is_dir():
             md_file = article_subdir / 'article.md'
             if md_file.exists():
-                info = convert_md_to_html(md_file, output_file=article_subdir / 'index.html', template_file=article_template)
-                if not info.get('draft', False):
-                    articles_info.append(info)
-                else:
-                    print(f"📝 Skipping draft article: {info['title']}")
+                output_file = article_subdir / 'index.html'
+                digest = article_inputs_hash(md_file, article_template, code_hash)
+                entry = cached.get(md_file.as_posix())
+                found.append((md_file, digest, entry))
+                if (force or not entry or entry['hash'] != digest
+                        or not output_file.exists() or not (article_subdir / 'og.png').exists()):
+                    stale.append(((md_file,), {'output_file': output_file, 'template_file': article_template}))
             else:
                 print(f"⚠️  No article.md found in {article_subdir}")
+    lap('manifest')
+
+    compiled = dict(zip((args[0] for args, _ in stale),
+                        run_jobs(convert_md_to_html, stale, jobs)))
+
+    for md_file, digest, entry in found:
+        if md_file in compiled:
+            info = compiled[md_file]
+        else:
+            info = entry['info']
+            unchanged += 1
+        built[md_file.as_posix()] = {'hash': digest, 'info': info}
+        if not info.get('draft', False):
+            articles_info.append(info)
+        else:
+            print(f"📝 Skipping draft article: {info['title']}")
+
+    write_main_index(articles_info, index_template, main_index)
 
-    with open(index_template, 'r', encoding='utf-8') as f:
-        template = f.read()
+    if unchanged:
+        print(f"· {unchanged} unchanged article(s) reused from {BUILD_MANIFEST}")
 
-    articles_html = ""
+    # Only touch the manifest when something moved; with render.write_page
+    # leaving identical pages (index.html included) alone, a no-op build
+    # leaves no trace for the live-reload watcher.
+    if built != cached:
+        manifest['articles'] = built
+        save_manifest(manifest)
+
+
+def write_main_index(articles_info, index_template='index_template.html', main_index='index.html'):
+    lap = timings.laps(main_index)
+    cards = []
     for art in sorted(articles_info, key=lambda x: parse_date(x['date']), reverse=True):
         date_formatted = format_date_display(art['date'])
         # Articles published on Medium link out to Medium; the byline credits
@@ -443,7 +535,7 @@ def generate_all_articles(articles_dir='articles', article_template='article_tem
             f'<a href="{href}"{ext} tabindex="-1"><img src="{art["thumbnail"]}" '
             f'alt="{art["title"]}"></a>' if art["thumbnail"] else "")
 
-        articles_html += f"""
+        cards.append(f"""
         <article class="article-item">
             <div class="article-content">
                 <h3 class="article-title"><a href="{href}"{ext}>{art['title']}</a></h3>
@@ -454,28 +546,122 @@ def generate_all_articles(articles_dir='articles', article_template='article_tem
                 {thumbnail_html}
             </div>
         </article>
-        """
+        """)
 
-    final_index = template.replace('{{ARTICLES}}', articles_html)
-
-    with open(main_index, 'w', encoding='utf-8') as f:
-        f.write(final_index)
+    render.write_page(main_index, render.load_template(index_template).segments(ARTICLES=cards))
+    lap('index')
 
     print(f"✓ Generated main index: {main_index}")
 
 
+def rebuild_articles(md_files, article_template='article_template.html', index_template='index_template.html',
+                     main_index='index.html', jobs=1, refresh_index=False, articles_dir='articles'):
+    """Recompile just these articles (the watcher's path).
+
+    The homepage is rewritten only when one of them changed its listing
+    metadata (title, date, description, thumbnail, ...), or when asked to
+    because the index template itself changed. Every other card comes from
+    BUILD_MANIFEST, so nothing else is read; if the manifest lacks an article
+    that is on disk (deleted, or never built), this falls back to
+    generate_all_articles so the homepage never loses a card.
+    """
+    manifest = load_manifest()
+    cached = manifest.setdefault('articles', {})
+    listing_changed = refresh_index
+
+    requested = {Path(md_file).as_posix() for md_file in md_files}
+    on_disk = {md_file.as_posix() for md_file in Path(articles_dir).glob('*/article.md')}
+    if on_disk - requested - set(cached):
+        print(f"· {BUILD_MANIFEST} is missing articles, rebuilding all of them")
+        generate_all_articles(articles_dir, article_template, index_template, main_index, jobs=jobs)
+        return
+
+    calls = []
+    for md_file in md_files:
+        md_file = Path(md_file)
+        if md_file.exists():
+            calls.append(((md_file,), {'output_file': md_file.parent / 'index.html', 'template_file': article_template}))
+        elif cached.pop(md_file.as_posix(), None):
+            listing_changed = True
+
+    code_hash = build_code_hash()
+    for (args, _), info in zip(calls, run_jobs(convert_md_to_html, calls, jobs)):
+        key = args[0].as_posix()
+        if key not in cached or cached[key]['info'] != info:
+            listing_changed = True
+        cached[key] = {'hash': article_inputs_hash(args[0], article_template, code_hash), 'info': info}
+    save_manifest(manifest)
+
+    if listing_changed:
+        infos = [cached[key]['info'] for key in sorted(cached)]
+        write_main_index([info for info in infos if not info.get('draft', False)], index_template, main_index)
+
+
+class DependencyGraph:
+    """Which outputs each source file feeds.
+
+    Outputs are ('article', <article.md>), ('deck', <slides.md>) and ('index',)
+    for the homepage template; sources are keyed by their posix path relative
+    to the site root, as watchdog reports them. Files that pages only link to
+    (style.css, presentation.css, figures) feed no output: serve.py reloads the
+    browser on those directly, nothing needs recompiling.
+    """
+
+    def __init__(self):
+        self.sources = {}
+        self.outputs = {}
+
+    def set_sources(self, output, paths):
+        for key in self.sources.pop(output, ()):
+            self.outputs[key].discard(output)
+        keys = {Path(p).as_posix() for p in paths}
+        self.sources[output] = keys
+        for key in keys:
+            self.outputs.setdefault(key, set()).add(output)
+
+    def outputs_of(self, path):
+        return set(self.outputs.get(Path(path).as_posix(), ()))
+
+
+def build_dependency_graph(articles_dir='articles', article_template='article_template.html',
+                           index_template='index_template.html', presentations_dir='presentations',
+                           presentation_template='presentation_template.html'):
+    graph = DependencyGraph()
+    graph.set_sources(('index',), [index_template])
+    for md_file in sorted(Path(articles_dir).glob('*/article.md')):
+        graph.set_sources(('article', md_file.as_posix()), article_dependencies(md_file, article_template))
+    for slides_md in sorted(Path(presentations_dir).glob('*/slides.md')):
+        if not slides_md.parent.name.startswith('_'):
+            graph.set_sources(('deck', slides_md.as_posix()),
+                              presentation_dependencies(slides_md, presentation_template))
+    return graph
+
+
 class ArticleEventHandler(FileSystemEventHandler):
     def __init__(self, articles_dir='articles', article_template='article_template.html',
                  index_template='index_template.html', main_index='index.html',
-                 presentations_dir='presentations', presentation_template='presentation_template.html'):
+                 presentations_dir='presentations', presentation_template='presentation_template.html',
+                 jobs=1, quiet_seconds=0.3):
         self.articles_dir = articles_dir
         self.article_template = article_template
         self.index_template = index_template
         self.main_index = main_index
         self.presentations_dir = presentations_dir
         self.presentation_template = presentation_template
-        self.last_regenerate = 0
-        self.debounce_seconds = 1
+        self.jobs = jobs
+        self.graph = build_dependency_graph(articles_dir, article_template, index_template,
+                                            presentations_dir, presentation_template)
+        # Events only record which paths changed; one worker thread drains the
+        # set once nothing has moved for quiet_seconds. A burst of saves (git
+        # checkout, write-temp-then-rename) becomes a single rebuild that sees
+        # the final bytes, and anything saved while a build runs queues exactly
+        # one follow-up build instead of being dropped.
+        self.quiet_seconds = quiet_seconds
+        self._changed = set()
+        self._last_event = 0
+        self._cond = threading.Condition()
+        self._worker = threading.Thread(target=self._drain, daemon=True)
+        self._worker.start()
 
     # Editors save in different ways (in-place write, or write-temp-then-rename),
     # so react to created/modified/moved alike.
@@ -492,54 +678,86 @@ class ArticleEventHandler(FileSystemEventHandler):
             self._react(getattr(event, 'dest_path', event.src_path))
 
     def _react(self, src_path):
-        file_path = Path(src_path)
-        # Ignore generated output so we don't loop forever.
-        if file_path.name == 'index.html' and self.presentations_dir in str(file_path):
-            return
+        with self._cond:
+            self._changed.add(src_path)
+            self._last_event = time.monotonic()
+            self._cond.notify()
 
-        is_article_change = (file_path.name == 'article.md' or
-            file_path.name in [self.article_template, self.index_template] or
-            (file_path.suffix in ['.html', '.png'] and self.articles_dir in str(file_path)))
-
-        is_presentation_change = (file_path.name == self.presentation_template or
-            (file_path.suffix in ['.md', '.svg', '.png', '.html'] and self.presentations_dir in str(file_path)))
-
-        if not (is_article_change or is_presentation_change):
-            return
-
-        current_time = time.time()
-        if current_time - self.last_regenerate < self.debounce_seconds:
+    def _drain(self):
+        while True:
+            with self._cond:
+                while not self._changed:
+                    self._cond.wait()
+                # Every new event pushes the deadline back until the burst settles.
+                while True:
+                    remaining = self._last_event + self.quiet_seconds - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                changed, self._changed = self._changed, set()
+            self._rebuild_changed(changed)
+
+    def _rebuild_changed(self, changed):
+        outputs = set()
+        names = set()
+        for src_path in changed:
+            file_path = Path(src_path)
+            # Generated files (index.html, og.png, the manifest) are not sources
+            # of anything, so they add nothing here and we don't loop forever.
+            fed = self.graph.outputs_of(file_path) or self._new_output(file_path)
+            if fed:
+                outputs |= fed
+                names.add(file_path.name)
+        if not outputs:
             return
 
-        self.last_regenerate = current_time
-        print(f"\n🔄 Change detected in {file_path.name}, regenerating...")
+        names = ', '.join(sorted(names))
+        print(f"\n🔄 Change detected in {names}, rebuilding {len(outputs)} output(s)...")
         try:
-            if is_article_change:
-                generate_all_articles(
-                    articles_dir=self.articles_dir,
-                    article_template=self.article_template,
-                    index_template=self.index_template,
-                    main_index=self.main_index
-                )
-            generate_all_presentations(
-                presentations_dir=self.presentations_dir,
-                template=self.presentation_template
-            )
+            self.rebuild(outputs)
         except Exception as e:
             print(f"❌ Error during regeneration: {e}")
 
+    def _new_output(self, file_path):
+        """A Markdown source the graph has not seen yet (a freshly created talk or article)."""
+        if file_path.name == 'article.md' and file_path.parent.parent == Path(self.articles_dir):
+            return {('article', file_path.as_posix())}
+        if (file_path.name == 'slides.md' and file_path.parent.parent == Path(self.presentations_dir)
+                and not file_path.parent.name.startswith('_')):
+            return {('deck', file_path.as_posix())}
+        return set()
+
+    def rebuild(self, outputs):
+        articles = sorted(out[1] for out in outputs if out[0] == 'article')
+        decks = sorted(out[1] for out in outputs if out[0] == 'deck')
+        if articles or ('index',) in outputs:
+            rebuild_articles(articles, self.article_template, self.index_template, self.main_index,
+                             jobs=self.jobs, refresh_index=('index',) in outputs, articles_dir=self.articles_dir)
+        if decks:
+            calls = [((Path(md),), {'output_file': Path(md).parent / 'index.html',
+                                    'template_file': self.presentation_template}) for md in decks]
+            run_jobs(convert_slides_to_html, calls, self.jobs)
+
+        # Embeds may have been added or removed: refresh the edges we just rebuilt.
+        for md in articles:
+            if Path(md).exists():
+                self.graph.set_sources(('article', md), article_dependencies(md, self.article_template))
+        for md in decks:
+            if Path(md).exists():
+                self.graph.set_sources(('deck', md), presentation_dependencies(md, self.presentation_template))
+
 
 def watch_and_generate(articles_dir='articles', article_template='article_template.html',
-                      index_template='index_template.html', main_index='index.html'):
+                      index_template='index_template.html', main_index='index.html', jobs=1):
 
     print("🚀 Starting site generator with file watching...")
     print(f"📁 Watching: {articles_dir} and presentations\n")
     print("📝 Press Ctrl+C to stop\n")
 
-    generate_all_articles(articles_dir, article_template, index_template, main_index)
-    generate_all_presentations()
+    generate_all_articles(articles_dir, article_template, index_template, main_index, jobs=jobs)
+    generate_all_presentations(jobs=jobs)
 
-    event_handler = ArticleEventHandler(articles_dir, article_template, index_template, main_index)
+    event_handler = ArticleEventHandler(articles_dir, article_template, index_template, main_index, jobs=jobs)
     observer = Observer()
 
     observer.schedule(event_handler, articles_dir, recursive=True)
@@ -560,10 +778,33 @@ def watch_and_generate(articles_dir='articles', article_template='article_templa
 
 
 if __name__ == "__main__":
-    import sys
-
-    if len(sys.argv) > 1 and sys.argv[1] == '--watch':
-        watch_and_generate()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile articles/ and presentations/ to HTML.")
+    parser.add_argument('--watch', action='store_true', help="rebuild whenever a source file changes")
+    parser.add_argument('--force', action='store_true', help=f"ignore {BUILD_MANIFEST} and recompile every article")
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help="compile articles and decks in N processes (0 = one per CPU)")
+    parser.add_argument('--profile', nargs='?', const='build-trace.json', metavar='TRACE',
+                        help="time every stage, print a report and write a Chrome trace "
+                             "(default: build-trace.json)")
+    parser.add_argument('--compress', action='store_true',
+                        help="also write precompressed .gz/.br sidecars for text assets (see compress.py)")
+    args = parser.parse_args()
+    if args.profile and args.watch:
+        parser.error("--profile times a one-off build; drop --watch")
+
+    if args.watch:
+        watch_and_generate(jobs=args.jobs)
     else:
-        generate_all_articles()
-        generate_all_presentations()
\ No newline at end of file
+        timings.enable(bool(args.profile))
+        generate_all_articles(force=args.force, jobs=args.jobs)
+        generate_all_presentations(jobs=args.jobs)
+        if args.compress:
+            manifest = load_manifest()
+            compress.compress_site('.', manifest.setdefault('compressed', {}))
+            save_manifest(manifest)
+        if args.profile:
+            timings.report()
+            timings.write_trace(args.profile)
+            print(f"\n✓ Trace written to {args.profile} (open in chrome://tracing or ui.perfetto.dev)")
\ No newline at end of file
@@ -0,0 +1,159 @@
+"""Open Graph preview images (og.png) for articles.
+
+Every article gets a 1200x630 social-preview card: its thumbnail, darkened,
+with the title set in ET Book on top. Cards are cached by content: each PNG
+carries a key derived from everything that shapes it (title, background
+bytes, size, font), and a card whose key still matches is left untouched.
+Retitle an article and its card is redrawn on the next build; otherwise the
+og.png bytes never change and git stays clean.
+
+    python og.py [--jobs N]     # check / refresh every article's og.png
+"""
+
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFont, PngImagePlugin
+
+import render
+
+DEFAULT_FONT = 'et-book.ttf'
+FONT_SIZE = 80
+OG_KEY = 'og-key'
+# Part of every cache key: bump it when the layout below changes so existing
+# cards get redrawn.
+OG_RENDER_VERSION = '2'
+
+
+@lru_cache(maxsize=None)
+def load_font(font_path, size):
+    try:
+        return ImageFont.truetype(font_path, size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=256)
+def _digest(path, mtime_ns, size):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def file_digest(path):
+    """sha256 of a file, memoized on (path, mtime, size)."""
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return 'missing'
+    return _digest(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def og_cache_key(title, background_path=None, width=1200, height=630, font_path=None):
+    h = hashlib.sha256()
+    for part in (OG_RENDER_VERSION, title,
+                 file_digest(background_path) if background_path else 'none',
+                 f'{width}x{height}', file_digest(font_path or DEFAULT_FONT)):
+        h.update(part.encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def stored_key(path):
+    """The cache key an og.png was rendered with, or None (missing / pre-cache file)."""
+    try:
+        with Image.open(path) as img:
+            return img.info.get(OG_KEY)
+    except OSError:
+        return None
+
+
+def wrap_title(title, font, max_width):
+    """Greedy word wrap that measures every word exactly once."""
+    space = font.getlength(' ')
+    lines, current, current_width = [], [], 0
+    for word in title.split():
+        word_width = font.getlength(word)
+        if current and current_width + space + word_width > max_width:
+            lines.append(' '.join(current))
+            current, current_width = [word], word_width
+        else:
+            current_width += (space if current else 0) + word_width
+            current.append(word)
+    lines.append(' '.join(current))
+    return lines
+
+
+def generate_og_thumbnail(output_path, title, background_path=None, width=1200, height=630, font_path=None,
+                          key=None):
+    if background_path and Path(background_path).exists():
+        img = Image.open(background_path).convert("RGB").resize((width, height))
+    else:
+        img = Image.new('RGB', (width, height), color=(40, 40, 40))
+
+    overlay = Image.new('RGBA', (width, height), (0, 0, 0, 150))
+    img = Image.alpha_composite(img.convert('RGBA'), overlay)
+
+    font = load_font(font_path or DEFAULT_FONT, FONT_SIZE)
+    lines = wrap_title(title, font, width - 100)
+
+    draw = ImageDraw.Draw(img)
+    boxes = [draw.textbbox((0, 0), line, font=font) for line in lines]
+    y_text = (height - sum(bbox[3] - bbox[1] for bbox in boxes)) // 2
+    for line, bbox in zip(lines, boxes):
+        x_text = (width - (bbox[2] - bbox[0])) // 2
+        draw.text((x_text, y_text), line, font=font, fill=(255, 255, 255))
+        y_text += bbox[3] - bbox[1]
+
+    info = PngImagePlugin.PngInfo()
+    info.add_text(OG_KEY, key or og_cache_key(title, background_path, width, height, font_path))
+    img.convert('RGB').save(output_path, pnginfo=info)
+    return output_path
+
+
+def ensure_og_image(output_path, title, background_path=None, width=1200, height=630, font_path=None):
+    """Render output_path unless it already holds this exact card. Returns True if redrawn."""
+    key = og_cache_key(title, background_path, width, height, font_path)
+    if stored_key(output_path) == key:
+        return False
+    generate_og_thumbnail(output_path, title, background_path, width, height, font_path, key=key)
+    return True
+
+
+def ensure_og_images(cards, jobs=1):
+    """ensure_og_image over (output_path, title, background_path) tuples, across
+    jobs processes (0 = one per CPU). Returns how many cards were redrawn."""
+    cards = list(cards)
+    if jobs == 1 or len(cards) < 2:
+        return sum(ensure_og_image(*card) for card in cards)
+    with ProcessPoolExecutor(max_workers=jobs or None) as pool:
+        return sum(pool.map(ensure_og_image, *zip(*cards)))
+
+
+def article_cards(articles_dir='articles'):
+    """(og.png, title, background) for every article, as convert_md_to_html sees them."""
+    for md_file in sorted(Path(articles_dir).glob('*/article.md')):
+        text = md_file.read_text(encoding='utf-8')
+        frontmatter_match = render.FRONTMATTER_RE.search(text)
+        frontmatter = frontmatter_match.group(1) if frontmatter_match else ''
+        title_match = render.FRONTMATTER_FIELD_RE['title'].search(frontmatter)
+        thumbnail_match = render.FRONTMATTER_FIELD_RE['thumbnail'].search(frontmatter)
+        if thumbnail_match:
+            thumbnail = thumbnail_match.group(1).strip()
+        else:
+            local_thumb = md_file.parent / 'thumbnail.png'
+            thumbnail = local_thumb.as_posix() if local_thumb.exists() else None
+        yield (md_file.parent / 'og.png',
+               title_match.group(1).strip() if title_match else "Untitled Article",
+               thumbnail)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Refresh every article's og.png.")
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help="render in N processes (0 = one per CPU)")
+    args = parser.parse_args()
+    redrawn = ensure_og_images(article_cards(), jobs=args.jobs)
+    print(f"✓ {redrawn} og.png card(s) redrawn")
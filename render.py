@@ -0,0 +1,192 @@
+"""Markdown rendering engine shared by the article and slide compilers.
+
+generate.py converts one Markdown document per article and one per slide
+(two when the slide has speaker notes). Building a markdown.Markdown instance
+loads and registers every extension, which costs more than converting a
+typical slide, so converters are built once per extension config and reset
+between documents. The regexes the compilers run on every document are
+compiled once, here, at import.
+"""
+
+import filecmp
+import os
+import re
+import stat
+import tempfile
+import threading
+from pathlib import Path
+
+import markdown
+
+# ---------------------------------------------------------------------------
+# Pattern table
+# ---------------------------------------------------------------------------
+
+FRONTMATTER_RE = re.compile(r'^---\s*\n(.*?)\n---\s*\n', re.DOTALL)
+FRONTMATTER_FIELD_RE = {
+    name: re.compile(rf'{name}:\s*(.+)')
+    for name in ('title', 'date', 'description', 'thumbnail', 'medium')
+}
+DRAFT_RE = re.compile(r'draft:\s*(true|false)', re.IGNORECASE)
+THUMBNAIL_LINE_RE = re.compile(r'^thumbnail:\s*(.+)', re.MULTILINE)
+
+HTML_EMBED_RE = re.compile(r':::html\s+(.+?)\s+:::', re.DOTALL)
+MATH_BLOCK_RE = re.compile(r'\$\$(.*?)\$\$', re.DOTALL)
+MATH_INLINE_RE = re.compile(r'(?<!\$)\$(?!\$)(.+?)(?<!\$)\$(?!\$)', re.DOTALL)
+SCRIPT_RE = re.compile(r'(<script[^>]*>)(.*?)(</script>)', re.DOTALL | re.IGNORECASE)
+PLACEHOLDER_RE = re.compile(r'\{\{(HTMLEMBED|MATHBLOCK|MATHINLINE)_(\d+)\}\}')
+TEMPLATE_SLOT_RE = re.compile(r'\{\{([A-Z_]+)\}\}')
+
+SLIDE_ATTRS_RE = re.compile(r'<!--\s*\.slide:\s*(.*?)-->', re.DOTALL)
+SLIDE_NOTES_RE = re.compile(r'(?m)^Note:[ \t]*$')
+SLIDE_SPLIT_RE = re.compile(r'(?m)^---[ \t]*$')
+SUBSLIDE_SPLIT_RE = re.compile(r'(?m)^--[ \t]*$')
+
+# ---------------------------------------------------------------------------
+# Converter pool
+# ---------------------------------------------------------------------------
+
+CONVERTER_CONFIGS = {
+    'article': {
+        'extensions': ['extra', 'fenced_code', 'codehilite'],
+        'extension_configs': {
+            'codehilite': {'guess_lang': False, 'use_pygments': False}
+        },
+    },
+    'slide': {
+        'extensions': ['extra'],
+    },
+}
+
+# Converters keep per-document state between reset() calls, so each thread
+# (the build and the --watch worker) gets its own pool.
+_local = threading.local()
+
+
+def get_converter(config):
+    """The pooled markdown.Markdown for this config, reset and ready for a new document."""
+    pool = _local.__dict__.setdefault('converters', {})
+    md = pool.get(config)
+    if md is None:
+        md = pool[config] = markdown.Markdown(**CONVERTER_CONFIGS[config])
+    return md.reset()
+
+
+def markdown_to_html(text, config='article'):
+    return get_converter(config).convert(text)
+
+
+# ---------------------------------------------------------------------------
+# Placeholder restoration
+#
+# Embeds and math are swapped for {{HTMLEMBED_i}} / {{MATHBLOCK_i}} /
+# {{MATHINLINE_i}} before Markdown sees them. Putting them back with one
+# str.replace per item rescans (and copies) the whole document each time,
+# which is quadratic on math-heavy pages; this does a single scan instead.
+# ---------------------------------------------------------------------------
+
+def iter_placeholders(html, embeds=(), blocks=(), inlines=()):
+    """Yield html piece by piece with every stashed embed and formula put back."""
+    stores = {
+        'HTMLEMBED': embeds,
+        'MATHBLOCK': [f"$$\n{tex}\n$$" for tex in blocks],
+        'MATHINLINE': [f"${tex}$" for tex in inlines],
+    }
+    pos = 0
+    for m in PLACEHOLDER_RE.finditer(html):
+        store = stores[m.group(1)]
+        idx = int(m.group(2))
+        # Leave anything we did not stash (e.g. literal text in a code span) alone.
+        if idx < len(store):
+            yield html[pos:m.start()]
+            yield store[idx]
+            pos = m.end()
+    yield html[pos:]
+
+
+def restore_placeholders(html, embeds=(), blocks=(), inlines=()):
+    """Substitute every stashed embed and formula back into html in one pass."""
+    return ''.join(iter_placeholders(html, embeds, blocks, inlines))
+
+
+# ---------------------------------------------------------------------------
+# Templates
+#
+# article_template.html, presentation_template.html and index_template.html
+# are split once into literal text and {{SLOT}} names, then rendered with a
+# single join. Chained str.replace calls copied the whole page (article body
+# included) once per slot, and would also have substituted a {{SLOT}} that
+# happened to appear inside the inserted content.
+# ---------------------------------------------------------------------------
+
+class Template:
+    def __init__(self, text):
+        parts = TEMPLATE_SLOT_RE.split(text)
+        self.literals = parts[0::2]
+        self.slots = parts[1::2]
+
+    def segments(self, **values):
+        """Yield the page piece by piece; slots without a value are left as-is.
+
+        A value may also be an iterable of strings (e.g. iter_placeholders),
+        streamed through without being joined. It is consumed on first use,
+        so only pass one for a slot that appears once.
+        """
+        yield self.literals[0]
+        for slot, literal in zip(self.slots, self.literals[1:]):
+            value = values.get(slot)
+            if value is None:
+                yield f"{{{{{slot}}}}}"
+            elif isinstance(value, str):
+                yield value
+            else:
+                yield from value
+            yield literal
+
+    def render(self, **values):
+        return ''.join(self.segments(**values))
+
+
+_templates = {}
+
+
+def load_template(path):
+    """Parsed template for path, re-read only when the file changes on disk."""
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _templates.get(str(path))
+    if cached and cached[0] == stamp:
+        return cached[1]
+    with open(path, 'r', encoding='utf-8') as f:
+        template = Template(f.read())
+    _templates[str(path)] = (stamp, template)
+    return template
+
+
+def write_page(path, segments):
+    """Stream segments to path through a buffered writer, atomically.
+
+    The page goes to a hidden temp file in the same directory, which then
+    replaces path in one rename: serve.py (or a browser mid-reload) sees
+    either the old page or the new one, never half of it. A page identical
+    to the one on disk is not replaced at all, so its mtime (what the
+    live-reload watcher and the .gz/.br sidecars go by) stays put. Returns
+    True if path was written.
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            for piece in segments:
+                f.write(piece)
+        if path.exists() and filecmp.cmp(tmp, path, shallow=False):
+            os.unlink(tmp)
+            return False
+        # mkstemp files are private; keep the mode a plain open() would give.
+        mode = stat.S_IMODE(path.stat().st_mode) if path.exists() else 0o644
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return True
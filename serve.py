@@ -4,50 +4,193 @@
 Serves the site like `python -m http.server`, and additionally:
   - watches the source tree and bumps a version counter whenever a built file
     (.html/.css/.js/.svg/.png/...) changes;
-  - injects a tiny polling script into every HTML page that reloads the browser
-    as soon as that counter changes.
+  - injects a tiny script into every HTML page that reloads the browser as
+    soon as that counter changes. The counter is pushed over Server-Sent
+    Events (/__livereload/events), so a reload is near-instant and an idle tab
+    costs nothing; browsers that can't keep the stream open fall back to
+    polling /__livereload.
+  - sends static files with sendfile and answers Range requests (206), so
+    PDFs, fonts and video can be fetched in pieces;
+  - hands out the .br/.gz sidecars of `generate.py --compress` to clients
+    that take them, and gzips the pages it injects the script into itself;
+  - speaks HTTP/1.1 with persistent connections, so a page and all its
+    figures share a handful of sockets.
 
 generate.py --watch still does the Markdown -> HTML compiling; this server just
 notices the resulting file change and refreshes the open tab. Run via dev.sh.
 
-    python serve.py [port]      # default 8000
+    python serve.py [port]          # default 8000
+    python serve.py [port] --async  # one asyncio event loop instead of a thread per connection
+    python serve.py [port] --prod   # preview/production: fixed route table, no live reload
+    python serve.py --metrics [N]   # Prometheus metrics at /__metrics, console summary every N s
 """
 
-import sys
+import argparse
+import asyncio
+import bisect
+import email.utils
+import gzip
+import hashlib
+import html
+import http.client
+import io
+import mimetypes
+import os
+import posixpath
 import threading
+import time
+import urllib.parse
+from collections import OrderedDict, defaultdict
+from http import HTTPStatus
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from types import MappingProxyType
 
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
-PORT = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+import compress
 
 # Only a change to one of these (the *built* outputs) should trigger a reload —
 # editing a .md is what makes generate.py rewrite the .html, and THAT is what we
 # react to. This avoids reloading before the compile has finished.
 RELOAD_SUFFIXES = {'.html', '.css', '.js', '.svg', '.png', '.jpg', '.jpeg', '.gif', '.pdf', '.json'}
 
+# Sidecars written by `generate.py --compress` (compress.py), best first.
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+# With --prod, figures, fonts and PDFs are cached by the browser for a day, so
+# reloading a figure-heavy article costs no requests for them at all. The dev
+# server sends no-cache for everything: the watcher reloads the tab when a
+# figure, thumbnail.png or og.png is regenerated, and a max-age would show the
+# old image. Revalidating an unchanged file is a cheap 304 thanks to the ETag.
+STATIC_MAX_AGE = 86400
+LONG_CACHE_SUFFIXES = {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.ico',
+                       '.ttf', '.otf', '.woff', '.woff2', '.pdf', '.mp4', '.webm'}
+
+# Never part of the --prod route table (nor is anything starting with a dot):
+# the directories compress.py skips (virtualenvs, caches, benchmarks and their
+# history.json), the build and dev tooling, the gitignored local artefacts of
+# builds and reviews, and .gz/.br sidecars, which are served only as variants
+# of their source.
+PROD_SKIP_DIRS = compress.SKIP_DIRS
+PROD_SKIP_SUFFIXES = {'.py', '.pyc', '.sh', '.jsonl', '.patch', '.tmp', '.gz', '.br'}
+PROD_SKIP_FILES = {'requirements.txt', 'build-trace.json', 'FEATURE_REQUESTS.md',
+                   'test_output.txt', 'bench_output.txt'}
+
+# Upper bound on the injected HTML pages kept in memory (see PageCache).
+PAGE_CACHE_BYTES = 64 * 1024 * 1024
+
+# The dev server can't use sidecars for pages it injects the reload script
+# into, so it gzips those itself, once per cached page. Level 6: a page is
+# compressed on every cache miss, and 9 barely makes it smaller.
+PAGE_GZIP_LEVEL = 6
+
+# A kept-alive connection with no new request for this long is closed, which
+# frees its thread (threaded server) or socket.
+KEEPALIVE_TIMEOUT = 15
+
+# An open event stream sends a comment this often, so a closed tab is noticed
+# (the write fails) and its thread released.
+SSE_KEEPALIVE_SECONDS = 15
+LIVERELOAD_POLL = '/__livereload'
+LIVERELOAD_EVENTS = '/__livereload/events'
+METRICS_PATH = '/__metrics'
+# Sent first on every event stream: reconnect quickly after a server restart.
+SSE_PREAMBLE = b'retry: 500\n\n'
+SSE_KEEPALIVE = b': keepalive\n\n'
+
 _version = 0
 _lock = threading.Lock()
+# Notified by ReloadWatcher._bump; every open event stream waits on it.
+_version_changed = threading.Condition(_lock)
+# Called (from watchdog's thread) after every bump; the asyncio server hooks in here.
+_bump_listeners = []
 
 LIVERELOAD_SNIPPET = b"""
 <script>
 (function () {
   let last = null;
+  function seen(v) {
+    if (last !== null && v !== last) { location.reload(); return true; }
+    last = v;
+    return false;
+  }
   async function poll() {
     try {
       const r = await fetch('/__livereload', { cache: 'no-store' });
-      const v = await r.text();
-      if (last !== null && v !== last) { location.reload(); return; }
-      last = v;
+      if (seen(await r.text())) return;
     } catch (e) { /* server busy/restarting; keep trying */ }
     setTimeout(poll, 400);
   }
-  poll();
+  if (!window.EventSource) { poll(); return; }
+  const es = new EventSource('/__livereload/events');
+  es.onmessage = (e) => { if (seen(e.data)) es.close(); };
+  // EventSource reconnects by itself after a restart; it only gives up
+  // (CLOSED) when the endpoint is missing, e.g. an older server.
+  es.onerror = () => { if (es.readyState === EventSource.CLOSED) poll(); };
 })();
 </script>
 """
+# Suffix of an injected page's ETag: a new snippet must not be answered with
+# 304 for a page the browser cached with the old one.
+LIVERELOAD_VARIANT = 'lr' + hashlib.sha256(LIVERELOAD_SNIPPET).hexdigest()[:8]
+
+
+class PageCache:
+    """LRU of fully injected HTML responses (and their gzip), bounded by their total size.
+
+    Keyed by absolute file path. Entries are never revalidated against the
+    disk: ReloadWatcher drops a page as soon as watchdog reports it changed,
+    so a hit costs no filesystem call, no read and no copy.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                self._entries.move_to_end(path)
+            return entry
+
+    @staticmethod
+    def _cost(entry):
+        body, _, _, gzipped = entry
+        return len(body) + (len(gzipped) if gzipped is not None else 0)
+
+    def put(self, path, body, etag, mtime, gzipped=None):
+        entry = (body, etag, mtime, gzipped)
+        if self._cost(entry) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self.size -= self._cost(old)
+            self._entries[path] = entry
+            self.size += self._cost(entry)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= self._cost(evicted)
+
+    def invalidate(self, path):
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self.size -= self._cost(old)
+
+
+_pages = PageCache(PAGE_CACHE_BYTES)
+
+
+def cacheable(path):
+    """Only pages ReloadWatcher can see change may be cached without revalidation."""
+    rel = Path(os.path.relpath(path))
+    return len(rel.parts) == 1 or rel.parts[0] in ('articles', 'presentations')
 
 
 class ReloadWatcher(FileSystemEventHandler):
@@ -58,8 +201,14 @@ class ReloadWatcher(FileSystemEventHandler):
         if Path(p).suffix.lower() not in RELOAD_SUFFIXES:
             return
         global _version
-        with _lock:
+        with _version_changed:
+            # Under the same lock route() holds to cache a page, so a read that
+            # raced this change can never be stored after the drop.
+            _pages.invalidate(os.path.abspath(p))
             _version += 1
+            _version_changed.notify_all()
+        for listener in _bump_listeners:
+            listener()
 
     def on_modified(self, event):
         if not event.is_directory:
@@ -71,73 +220,853 @@ class ReloadWatcher(FileSystemEventHandler):
 
     def on_moved(self, event):
         if not event.is_directory:
+            _pages.invalidate(os.path.abspath(event.src_path))
             self._bump(getattr(event, 'dest_path', event.src_path))
 
+    def on_deleted(self, event):
+        if not event.is_directory:
+            self._bump(event.src_path)
+
+
+def accepted_encodings(header):
+    """Content codings an Accept-Encoding header allows (q > 0)."""
+    accepted = set()
+    for item in header.split(','):
+        name, _, params = item.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name and q > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def precompressed_variant(target, accept_encoding):
+    """(sidecar path, encoding) for the best fresh .br/.gz of target the client takes, else None.
+
+    A sidecar older than its source (the page was rebuilt since the last
+    --compress) is ignored, so the dev server never serves stale content.
+    """
+    accepted = accepted_encodings(accept_encoding)
+    if not accepted:
+        return None
+    try:
+        source_mtime = target.stat().st_mtime_ns
+    except OSError:
+        return None
+    for encoding, suffix in PRECOMPRESSED:
+        if encoding not in accepted and '*' not in accepted:
+            continue
+        sidecar = target.with_name(target.name + suffix)
+        try:
+            if sidecar.stat().st_mtime_ns >= source_mtime:
+                return sidecar, encoding
+        except OSError:
+            continue
+    return None
+
+
+# path -> ((mtime_ns, size), etag): each file is hashed once per version.
+_etags = {}
+
+
+def file_etag(path, stat=None):
+    """Strong ETag from the file's sha256, cached until its mtime or size changes."""
+    stat = stat or path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _etags.get(str(path))
+    if cached and cached[0] == stamp:
+        return cached[1]
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    etag = f'"{h.hexdigest()[:32]}"'
+    _etags[str(path)] = (stamp, etag)
+    return etag
+
+
+def variant_etag(etag, variant):
+    """A distinct strong ETag for another representation of the same file."""
+    return f'{etag[:-1]}-{variant}"'
+
+
+def cache_control(path, prod=False):
+    if prod and path.suffix.lower() in LONG_CACHE_SUFFIXES:
+        return f'public, max-age={STATIC_MAX_AGE}'
+    return 'no-cache'
+
+
+# ---------------------------------------------------------------------------
+# Routing, shared by the threaded Handler and the asyncio server
+# ---------------------------------------------------------------------------
+
+class Reply:
+    """What to answer a GET with: status and headers, plus an in-memory body
+    or a file to stream (all of it, or the (offset, count) in span). The
+    sender adds Content-Length from whichever it is."""
+
+    def __init__(self, status, headers=(), body=None, file=None, span=None, reason=None):
+        self.status = status
+        self.reason = reason or HTTPStatus(status).phrase
+        self.headers = list(headers)
+        self.body = body
+        self.file = file
+        self.span = span
+
+
+def http_date(timestamp):
+    return email.utils.formatdate(timestamp, usegmt=True)
+
+
+def guess_type(path):
+    """Content-Type for path, as SimpleHTTPRequestHandler.guess_type picks it."""
+    ext = os.path.splitext(path)[1]
+    extensions = SimpleHTTPRequestHandler.extensions_map
+    return (extensions.get(ext) or extensions.get(ext.lower())
+            or mimetypes.guess_type(path)[0] or 'application/octet-stream')
+
+
+def translate_path(path):
+    """URL path -> file under the cwd, as SimpleHTTPRequestHandler.translate_path does it."""
+    path = path.split('?', 1)[0].split('#', 1)[0]
+    trailing_slash = path.rstrip().endswith('/')
+    try:
+        path = urllib.parse.unquote(path, errors='surrogatepass')
+    except UnicodeDecodeError:
+        path = urllib.parse.unquote(path)
+    result = os.getcwd()
+    for word in filter(None, posixpath.normpath(path).split('/')):
+        if os.path.dirname(word) or word in (os.curdir, os.pardir):
+            continue  # not a simple file/directory name
+        result = os.path.join(result, word)
+    return result + '/' if trailing_slash else result
+
+
+def not_modified(headers, etag, mtime):
+    """Whether the request's validators say the client already has this version."""
+    if_none_match = headers.get('If-None-Match')
+    if if_none_match is not None:
+        # If-None-Match uses the weak comparison: ignore any W/ prefix.
+        tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+        return '*' in tags or etag in tags
+    if_modified_since = headers.get('If-Modified-Since')
+    if if_modified_since:
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return int(mtime) <= since.timestamp()
+    return False
+
+
+def not_modified_reply(etag, mtime, cache):
+    return Reply(304, [('ETag', etag), ('Last-Modified', http_date(mtime)), ('Cache-Control', cache)])
+
+
+def error_reply(status, message=None):
+    """The error page BaseHTTPRequestHandler.send_error sends; message is also the reason phrase."""
+    status = HTTPStatus(status)
+    message = message or status.phrase
+    body = (SimpleHTTPRequestHandler.error_message_format % {
+        'code': status.value, 'message': html.escape(message, quote=False),
+        'explain': html.escape(status.description, quote=False)}).encode('utf-8', 'replace')
+    return Reply(status.value, [('Connection', 'close'),
+                                ('Content-Type', SimpleHTTPRequestHandler.error_content_type)],
+                 body=body, reason=message)
+
+
+def accepts_gzip(headers):
+    return bool(accepted_encodings(headers.get('Accept-Encoding', '')) & {'gzip', '*'})
+
+
+def page_reply(headers, body, etag, mtime, gzipped=None):
+    """An injected page, gzipped if there is a gzip of it and the client takes it."""
+    extra = []
+    if gzipped is not None:
+        extra.append(('Vary', 'Accept-Encoding'))
+        if accepts_gzip(headers):
+            body, etag = gzipped, variant_etag(etag, 'gzip')
+            extra.append(('Content-Encoding', 'gzip'))
+    if not_modified(headers, etag, mtime):
+        return not_modified_reply(etag, mtime, 'no-cache')
+    return Reply(200, [('Content-Type', 'text/html; charset=utf-8'), ('Cache-Control', 'no-cache'),
+                       ('ETag', etag), ('Last-Modified', http_date(mtime))] + extra, body=body)
+
+
+def byte_range(header, size):
+    """(start, end), end inclusive, for a single `Range: bytes=...` over size
+    bytes; start >= size means unsatisfiable. None means send the whole file:
+    no header, several ranges, or one that doesn't parse."""
+    if not header or not header.startswith('bytes=') or ',' in header:
+        return None
+    first, dash, last = header[6:].partition('-')
+    if not dash:
+        return None
+    try:
+        if not first.strip():
+            suffix = int(last)  # bytes=-N: the last N bytes
+            return (max(0, size - suffix), size - 1) if suffix > 0 else (size, size - 1)
+        start = int(first)
+        end = int(last) if last.strip() else None
+    except ValueError:
+        return None
+    if start < 0 or (end is not None and end < start):
+        return None
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+def range_applies(headers, etag, mtime):
+    """If-Range: a range request only stands if the client's copy is current."""
+    if_range = headers.get('If-Range')
+    return if_range is None or if_range.strip() in (etag, http_date(mtime))
+
+
+def static_reply(headers, target):
+    stat = target.stat()
+    etag = file_etag(target, stat)
+    body, size, encoding = target, stat.st_size, None
+    variant = precompressed_variant(target, headers.get('Accept-Encoding', ''))
+    if variant is not None:
+        body, encoding = variant
+        size, etag = body.stat().st_size, variant_etag(etag, encoding)
+    return file_reply(headers, body, size, etag, stat.st_mtime, guess_type(str(target)),
+                      cache_control(target), encoding)
+
+
+def file_reply(headers, body, size, etag, mtime, content_type, cache, encoding=None):
+    """200 / 206 / 304 / 416 for a file whose metadata the caller already has."""
+    if not_modified(headers, etag, mtime):
+        return not_modified_reply(etag, mtime, cache)
+
+    # PDFs, fonts and media get fetched in pieces (seeking a video, PDF.js).
+    span = None
+    if 'Range' in headers and range_applies(headers, etag, mtime):
+        span = byte_range(headers['Range'], size)
+    if span is not None and span[0] >= size:
+        return Reply(416, [('Content-Range', f'bytes */{size}'), ('Accept-Ranges', 'bytes')], body=b'')
+
+    reply = Reply(200 if span is None else 206, [('Content-Type', content_type)], file=body)
+    if encoding:
+        reply.headers.append(('Content-Encoding', encoding))
+    reply.headers += [('Vary', 'Accept-Encoding'), ('Accept-Ranges', 'bytes'), ('ETag', etag),
+                      ('Last-Modified', http_date(mtime)), ('Cache-Control', cache)]
+    if span is not None:
+        start, end = span
+        reply.headers.append(('Content-Range', f'bytes {start}-{end}/{size}'))
+        reply.span = (start, end - start + 1)
+    return reply
+
+
+def cached_route(path, headers):
+    """route()'s Reply when it needs no disk access (the poll counter, a page
+    in PageCache), else None."""
+    raw_path = path.split('?', 1)[0]
+    if raw_path == LIVERELOAD_POLL:
+        with _lock:
+            body = str(_version).encode()
+        return Reply(200, [('Content-Type', 'text/plain'), ('Cache-Control', 'no-store')], body=body)
+    if 'print-pdf' not in path:
+        target = Path(translate_path(path))
+        page = target / 'index.html' if raw_path.endswith('/') else target
+        cached = _pages.get(str(page))
+        if cached is not None:
+            return page_reply(headers, *cached)
+    return None
+
+
+def route(path, headers):
+    """The Reply for GET path once cached_route() had none, or None for what
+    plain http.server does anyway (directory listings, 404s). The event stream
+    is the server's own business."""
+    # Inject the reload script into HTML pages (but not into the PDF export).
+    raw_path = path.split('?', 1)[0]
+    target = Path(translate_path(path))
+    if target.is_dir():
+        # Redirect /dir -> /dir/ (standard server behaviour). Without this,
+        # serving index.html at the slash-less URL leaves the browser base at
+        # the PARENT dir, so every relative path (figs/…, iframes) 404s.
+        if not raw_path.endswith('/'):
+            return Reply(301, [('Location', raw_path + '/' + path[len(raw_path):])], body=b'')
+        target = target / 'index.html'
+    if target.suffix == '.html' and target.exists() and 'print-pdf' not in path:
+        with _lock:
+            seen = _version
+        stat = target.stat()
+        # The snippet is constant, so the injected page is a fixed variant of the file.
+        etag = variant_etag(file_etag(target, stat), LIVERELOAD_VARIANT)
+        # Same threshold as the sidecars; page_reply picks the representation.
+        compressed = stat.st_size >= compress.MIN_SIZE
+        sent = variant_etag(etag, 'gzip') if compressed and accepts_gzip(headers) else etag
+        if not_modified(headers, sent, stat.st_mtime):
+            return not_modified_reply(sent, stat.st_mtime, 'no-cache')
+        body = target.read_bytes()
+        if b'</body>' in body:
+            body = body.replace(b'</body>', LIVERELOAD_SNIPPET + b'</body>', 1)
+        else:
+            body += LIVERELOAD_SNIPPET
+        gzipped = gzip.compress(body, compresslevel=PAGE_GZIP_LEVEL, mtime=0) if compressed else None
+        if cacheable(target):
+            with _lock:
+                # A change since the stat may have been read half-written or
+                # already dropped: serve it this once, but don't keep it.
+                if _version == seen:
+                    _pages.put(str(target), body, etag, stat.st_mtime, gzipped)
+        return page_reply(headers, body, etag, stat.st_mtime, gzipped)
+
+    if target.is_file():
+        return static_reply(headers, target)
+    return None
+
+
+def directory_listing(fs_path, url_path):
+    """The page SimpleHTTPRequestHandler.list_directory serves, or None if unreadable."""
+    try:
+        names = sorted(os.listdir(fs_path), key=str.lower)
+    except OSError:
+        return None
+    try:
+        display = urllib.parse.unquote(url_path, errors='surrogatepass')
+    except UnicodeDecodeError:
+        display = urllib.parse.unquote(url_path)
+    title = f'Directory listing for {html.escape(display, quote=False)}'
+    lines = ['<!DOCTYPE HTML>', '<html lang="en">', '<head>', '<meta charset="utf-8">',
+             f'<title>{title}</title>\n</head>', f'<body>\n<h1>{title}</h1>', '<hr>\n<ul>']
+    for name in names:
+        full = os.path.join(fs_path, name)
+        shown = linked = name
+        if os.path.isdir(full):
+            shown, linked = name + '/', name + '/'
+        if os.path.islink(full):
+            shown = name + '@'
+        lines.append(f'<li><a href="{urllib.parse.quote(linked, errors="surrogatepass")}">'
+                     f'{html.escape(shown, quote=False)}</a></li>')
+    lines.append('</ul>\n<hr>\n</body>\n</html>\n')
+    return '\n'.join(lines).encode('utf-8', 'surrogateescape')
+
+
+def fallback_reply(path):
+    """What http.server answers when route() has nothing: a listing for a
+    directory without index.html, else 404."""
+    fs_path = translate_path(path)
+    if os.path.isdir(fs_path):
+        listing = directory_listing(fs_path, path)
+        if listing is not None:
+            return Reply(200, [('Content-type', 'text/html; charset=utf-8')], body=listing)
+    return error_reply(404, 'File not found')
+
+
+def respond(path, headers, site=None, metrics=None):
+    """The Reply for any GET but the event stream, in dev or --prod mode."""
+    return cached_reply(path, headers, site, metrics) or route(path, headers) or fallback_reply(path)
+
+
+def cached_reply(path, headers, site=None, metrics=None):
+    """respond()'s Reply when it needs no disk access, else None: metrics, any
+    --prod route (ProdSite is all in memory) and cached_route() in dev."""
+    if metrics is not None and path.split('?', 1)[0] == METRICS_PATH:
+        return metrics.reply()
+    if site is not None:
+        return site.reply(path, headers)
+    return cached_route(path, headers)
+
+
+# ---------------------------------------------------------------------------
+# Production mode (--prod): the built site as a route table
+# ---------------------------------------------------------------------------
+
+class StaticRoute:
+    """One file with everything a reply needs, computed once: size, type,
+    ETag, cache policy and its fresh .br/.gz sidecars (best first)."""
+
+    def __init__(self, path):
+        stat = path.stat()
+        self.file, self.size, self.mtime = path, stat.st_size, stat.st_mtime
+        self.etag = file_etag(path, stat)
+        self.content_type = guess_type(str(path))
+        self.cache = cache_control(path, prod=True)
+        self.variants = []
+        for encoding, suffix in PRECOMPRESSED:
+            sidecar = path.with_name(path.name + suffix)
+            try:
+                sidecar_stat = sidecar.stat()
+            except OSError:
+                continue
+            if sidecar_stat.st_mtime_ns >= stat.st_mtime_ns:
+                self.variants.append((encoding, sidecar, sidecar_stat.st_size, variant_etag(self.etag, encoding)))
+
+    def reply(self, headers):
+        body, size, etag, encoding = self.file, self.size, self.etag, None
+        if self.variants:
+            accepted = accepted_encodings(headers.get('Accept-Encoding', ''))
+            for candidate in self.variants:
+                if candidate[0] in accepted or '*' in accepted:
+                    encoding, body, size, etag = candidate
+                    break
+        reply = file_reply(headers, body, size, etag, self.mtime, self.content_type, self.cache, encoding)
+        if reply.file is not None and reply.span is None:
+            reply.span = (0, size)  # the site doesn't change under us: no fstat either
+        return reply
+
+
+class ProdSite:
+    """The site under root, walked once at startup into an immutable table
+    from URL path to StaticRoute (a directory's / maps to its index.html),
+    plus the slash-less directory paths that redirect. A request is one dict
+    lookup: no stat, no exists(), no live reload. Rebuilt the site? Restart.
+    """
+
+    def __init__(self, root='.'):
+        root = Path(root)
+        routes, dirs = {}, set()
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.') and d not in PROD_SKIP_DIRS]
+            base = Path(dirpath).relative_to(root).as_posix()
+            url = '/' if base == '.' else f'/{base}/'
+            if url != '/':
+                dirs.add(url[:-1])
+            for name in filenames:
+                if (not name.startswith('.') and name not in PROD_SKIP_FILES
+                        and Path(name).suffix.lower() not in PROD_SKIP_SUFFIXES):
+                    routes[url + name] = StaticRoute(Path(dirpath) / name)
+            if url + 'index.html' in routes:
+                routes[url] = routes[url + 'index.html']
+        self.routes = MappingProxyType(routes)
+        self.dirs = frozenset(dirs)
+
+    def reply(self, path, headers):
+        raw_path = path.split('?', 1)[0].split('#', 1)[0]
+        url = urllib.parse.unquote(raw_path)
+        route = self.routes.get(url)
+        if route is not None:
+            return route.reply(headers)
+        if url in self.dirs:
+            return Reply(301, [('Location', raw_path + '/' + path[len(raw_path):])], body=b'')
+        return error_reply(404, 'File not found')
+
+
+# ---------------------------------------------------------------------------
+# Request metrics (--metrics)
+# ---------------------------------------------------------------------------
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implied.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def route_label(raw_path, status):
+    """A small, fixed set of route names, so a crawler can't blow up the series."""
+    if raw_path in (LIVERELOAD_POLL, LIVERELOAD_EVENTS, METRICS_PATH):
+        return raw_path
+    if status == 301:
+        return 'redirect'
+    return 'page' if raw_path.endswith(('/', '.html')) else 'static'
+
+
+class Metrics:
+    """Per-route request counts by status, bytes sent and latency histograms.
+
+    observe() is a bisect and a few dict updates under a lock; with
+    --metrics off the servers hold None and skip it entirely. Served at
+    /__metrics in Prometheus text format; summary() condenses the interval
+    since its last call for the console.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = defaultdict(int)   # (route, status) -> count
+        self._bytes = defaultdict(int)      # route -> bytes sent
+        self._latency = {}                  # route -> [count per bucket ..., +Inf count, sum of seconds]
+        self._streams = 0
+        self._last = ({}, {}, {})
+
+    def observe(self, route, status, sent, seconds):
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            self._requests[route, status] += 1
+            self._bytes[route] += sent
+            histogram = self._latency.get(route)
+            if histogram is None:
+                histogram = self._latency[route] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0]
+            histogram[bucket] += 1
+            histogram[-1] += seconds
+
+    def stream_opened(self):
+        with self._lock:
+            self._streams += 1
+
+    def stream_closed(self):
+        with self._lock:
+            self._streams -= 1
+
+    def _snapshot(self):
+        with self._lock:
+            return (dict(self._requests), dict(self._bytes),
+                    {route: list(h) for route, h in self._latency.items()}, self._streams)
+
+    def render(self):
+        requests, sent, latency, streams = self._snapshot()
+        lines = ['# HELP serve_requests_total Requests answered, by route and status.',
+                 '# TYPE serve_requests_total counter']
+        lines += [f'serve_requests_total{{route="{route}",status="{status}"}} {n}'
+                  for (route, status), n in sorted(requests.items())]
+        lines += ['# HELP serve_response_bytes_total Response body bytes sent, by route.',
+                  '# TYPE serve_response_bytes_total counter']
+        lines += [f'serve_response_bytes_total{{route="{route}"}} {n}' for route, n in sorted(sent.items())]
+        lines += ['# HELP serve_request_duration_seconds Time to answer a request, by route.',
+                  '# TYPE serve_request_duration_seconds histogram']
+        for route, histogram in sorted(latency.items()):
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS + ('+Inf',), histogram):
+                cumulative += n
+                lines.append(f'serve_request_duration_seconds_bucket{{route="{route}",le="{bound}"}} {cumulative}')
+            lines.append(f'serve_request_duration_seconds_sum{{route="{route}"}} {histogram[-1]:.6f}')
+            lines.append(f'serve_request_duration_seconds_count{{route="{route}"}} {cumulative}')
+        lines += ['# HELP serve_event_streams_open Live-reload event streams currently open.',
+                  '# TYPE serve_event_streams_open gauge', f'serve_event_streams_open {streams}']
+        return '\n'.join(lines) + '\n'
+
+    def reply(self):
+        return Reply(200, [('Content-Type', 'text/plain; version=0.0.4; charset=utf-8'),
+                           ('Cache-Control', 'no-store')], body=self.render().encode())
+
+    def summary(self, seconds):
+        """One console block for what happened since the previous summary ('' if nothing did)."""
+        requests, sent, latency, streams = self._snapshot()
+        last_requests, last_sent, last_latency = self._last
+        self._last = (requests, sent, latency)
+        rows = []
+        for route, histogram in sorted(latency.items()):
+            before = last_latency.get(route, [0] * len(histogram))
+            counts = [now - then for now, then in zip(histogram[:-1], before[:-1])]
+            total = sum(counts)
+            if not total:
+                continue
+            statuses = ' '.join(f'{status}×{n - last_requests.get((r, status), 0)}'
+                                for (r, status), n in sorted(requests.items())
+                                if r == route and n > last_requests.get((r, status), 0))
+            mb = (sent.get(route, 0) - last_sent.get(route, 0)) / 1e6
+            rows.append(f"   {route:<22}{total:>7}{mb:>9.2f} MB  p50 {_quantile(counts, 0.5):>8}"
+                        f"  p95 {_quantile(counts, 0.95):>8}  {statuses}")
+        if not rows:
+            return ''
+        return '\n'.join([f"📊 last {seconds:g}s ({streams} live-reload stream(s) open):"] + rows)
+
+
+def _quantile(counts, q):
+    """Upper bound of the histogram bucket holding quantile q, for display."""
+    rank, seen = q * sum(counts), 0
+    for bound, n in zip(LATENCY_BUCKETS, counts):
+        seen += n
+        if seen >= rank:
+            return f'≤{bound * 1e3:g} ms'
+    return f'>{LATENCY_BUCKETS[-1] * 1e3:g} ms'
+
+
+def print_summaries(metrics, every):
+    def loop():
+        while True:
+            time.sleep(every)
+            text = metrics.summary(every)
+            if text:
+                print(text, flush=True)
+    threading.Thread(target=loop, name='metrics-summary', daemon=True).start()
+
+
+# ---------------------------------------------------------------------------
+# Threaded server (default)
+# ---------------------------------------------------------------------------
 
 class Handler(SimpleHTTPRequestHandler):
+    # Persistent connections: an article's dozens of figures, CSS, JS and
+    # fonts share a few sockets instead of one TCP handshake each. Every
+    # reply carries Content-Length (or closes the connection) for framing.
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEPALIVE_TIMEOUT
+    # Headers and body go out in separate writes; with Nagle on, the body
+    # would wait out the client's delayed ACK on a kept-alive connection.
+    disable_nagle_algorithm = True
+
+    # A ProdSite under --prod: requests are answered from it alone.
+    site = None
+    # A Metrics under --metrics.
+    metrics = None
+
     def log_message(self, fmt, *args):
         pass  # keep the console focused on rebuild messages
 
     def do_GET(self):
-        if self.path.split('?', 1)[0] == '/__livereload':
-            with _lock:
-                body = str(_version).encode()
-            self.send_response(200)
-            self.send_header('Content-Type', 'text/plain')
-            self.send_header('Cache-Control', 'no-store')
-            self.send_header('Content-Length', str(len(body)))
-            self.end_headers()
-            self.wfile.write(body)
-            return
+        self._handle(head=False)
 
-        # Inject the reload script into HTML pages (but not into the PDF export).
+    def do_HEAD(self):
+        self._handle(head=True)
+
+    def _handle(self, head):
+        start = time.perf_counter()
         raw_path = self.path.split('?', 1)[0]
-        target = Path(self.translate_path(self.path))
-        if target.is_dir():
-            # Redirect /dir -> /dir/ (standard server behaviour). Without this,
-            # serving index.html at the slash-less URL leaves the browser base at
-            # the PARENT dir, so every relative path (figs/…, iframes) 404s.
-            if not raw_path.endswith('/'):
-                self.send_response(301)
-                self.send_header('Location', raw_path + '/' + self.path[len(raw_path):])
-                self.end_headers()
-                return
-            target = target / 'index.html'
-        if target.suffix == '.html' and target.exists() and 'print-pdf' not in self.path:
-            html = target.read_bytes()
-            if b'</body>' in html:
-                html = html.replace(b'</body>', LIVERELOAD_SNIPPET + b'</body>', 1)
-            else:
-                html += LIVERELOAD_SNIPPET
-            self.send_response(200)
-            self.send_header('Content-Type', 'text/html; charset=utf-8')
-            self.send_header('Cache-Control', 'no-store')
-            self.send_header('Content-Length', str(len(html)))
-            self.end_headers()
-            self.wfile.write(html)
+        if raw_path == LIVERELOAD_EVENTS and self.site is None:
+            self._stream_versions()
             return
+        reply = respond(self.path, self.headers, self.site, self.metrics)
+        sent = self._send_reply(reply, head)
+        if self.metrics is not None:
+            self.metrics.observe(route_label(raw_path, reply.status), reply.status, sent,
+                                 time.perf_counter() - start)
+
+    def _send_reply(self, reply, head=False):
+        """Send reply; returns the body bytes written."""
+        self.send_response(reply.status, reply.reason)
+        for name, value in reply.headers:
+            self.send_header(name, value)
+        if reply.file is None:
+            if reply.body is not None:
+                self.send_header('Content-Length', str(len(reply.body)))
+            self.end_headers()
+            if reply.body and not head:
+                self.wfile.write(reply.body)
+                return len(reply.body)
+            return 0
+        with open(reply.file, 'rb') as f:
+            offset, count = reply.span or (0, os.fstat(f.fileno()).st_size)
+            self.send_header('Content-Length', str(count))
+            self.end_headers()
+            if head:
+                return 0
+            self._send_file(f, offset, count)
+            return count
+
+    def _send_file(self, f, offset, count):
+        # os.sendfile underneath: the kernel copies file pages straight to the
+        # socket, no trip through Python buffers (plain send() where unsupported).
+        self.connection.sendfile(f, offset, count)
 
-        return super().do_GET()
+    def _stream_versions(self):
+        """Server-Sent Events: the current version on connect, then each new one."""
+        start = time.perf_counter()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-store')
+        self.send_header('Connection', 'close')  # the stream ends when the socket does
+        self.end_headers()
+        if self.metrics is not None:
+            # Its "latency" is the time to open the stream; how long it stays
+            # open is the streams gauge's business.
+            self.metrics.observe(LIVERELOAD_EVENTS, 200, 0, time.perf_counter() - start)
+            self.metrics.stream_opened()
+        sent = None
+        try:
+            self.wfile.write(SSE_PREAMBLE)
+            while True:
+                with _version_changed:
+                    _version_changed.wait_for(lambda: _version != sent, timeout=SSE_KEEPALIVE_SECONDS)
+                    version = _version
+                if version != sent:
+                    self.wfile.write(f'data: {version}\n\n'.encode())
+                    sent = version
+                else:
+                    self.wfile.write(SSE_KEEPALIVE)
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # tab closed or navigated away
+        finally:
+            if self.metrics is not None:
+                self.metrics.stream_closed()
+
+
+# ---------------------------------------------------------------------------
+# asyncio server (--async)
+# ---------------------------------------------------------------------------
+
+class AsyncServer:
+    """Handler's behaviour on a single event loop.
+
+    A connection is a coroutine rather than an OS thread, so open event
+    streams and image-heavy pages cost no threads. Static bodies go out with
+    loop.sendfile (zero-copy where the OS supports it). Routing is the same
+    respond() the threaded Handler uses. Replies that need no disk access
+    (--prod routes, cached pages) are built on the loop. Anything else stats,
+    hashes, reads and gzips whole files, so it runs in a worker thread
+    instead of stalling every other connection.
+    """
+
+    server_version = f'{SimpleHTTPRequestHandler.server_version} {SimpleHTTPRequestHandler.sys_version}'
+
+    def __init__(self, site=None, metrics=None):
+        self.site = site
+        self.metrics = metrics
+        self._bumped = asyncio.Event()
+
+    def notify(self):
+        """Wake every event stream (call on the loop: ReloadWatcher runs in watchdog's thread)."""
+        bumped, self._bumped = self._bumped, asyncio.Event()
+        bumped.set()
+
+    async def handle(self, reader, writer):
+        try:
+            while await self._respond(reader, writer):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            pass  # client went away, or kept the connection idle too long
+        except asyncio.CancelledError:
+            pass  # shutting down; a connection has nothing left to clean up but its socket
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _respond(self, reader, writer):
+        """Answer one request; True if the connection stays open for the next."""
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEPALIVE_TIMEOUT)
+        except asyncio.LimitOverrunError:
+            await self._send(writer, error_reply(431))
+            return False
+        request_line, _, header_block = request.partition(b'\r\n')
+        request_line = request_line.decode('iso-8859-1')
+        words = request_line.split()
+        if len(words) != 3 or not words[2].startswith('HTTP/'):
+            await self._send(writer, error_reply(400, f'Bad request syntax ({request_line!r})'))
+            return False
+        method, path, version = words
+        if method not in ('GET', 'HEAD'):
+            await self._send(writer, error_reply(501, f'Unsupported method ({method!r})'))
+            return False
+        headers = http.client.parse_headers(io.BytesIO(header_block))
+        head = method == 'HEAD'
+
+        start = time.perf_counter()
+        raw_path = path.split('?', 1)[0]
+        if raw_path == LIVERELOAD_EVENTS and self.site is None:
+            await self._stream_versions(writer)
+            return False
+        reply = cached_reply(path, headers, self.site, self.metrics)
+        if reply is None:
+            reply = await asyncio.to_thread(respond, path, headers, self.site, self.metrics)
+        sent = await self._send(writer, reply, head)
+        if self.metrics is not None:
+            self.metrics.observe(route_label(raw_path, reply.status), reply.status, sent,
+                                 time.perf_counter() - start)
+        # Same rules as BaseHTTPRequestHandler: HTTP/1.1 persists unless told
+        # to close, HTTP/1.0 only on request.
+        connection = headers.get('Connection', '').lower()
+        if ('Connection', 'close') in reply.headers or 'close' in connection:
+            return False
+        return version != 'HTTP/1.0' or 'keep-alive' in connection
+
+    def _head(self, status, headers, reason=None):
+        lines = [f'HTTP/1.1 {status} {reason or HTTPStatus(status).phrase}',
+                 f'Server: {self.server_version}', f'Date: {http_date(time.time())}']
+        lines += [f'{name}: {value}' for name, value in headers]
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1', 'strict')
+
+    async def _send(self, writer, reply, head=False):
+        """Send reply; returns the body bytes written."""
+        if reply.file is None:
+            headers = reply.headers
+            if reply.body is not None:
+                headers = headers + [('Content-Length', str(len(reply.body)))]
+            writer.write(self._head(reply.status, headers, reply.reason))
+            sent = 0
+            if reply.body and not head:
+                writer.write(reply.body)
+                sent = len(reply.body)
+            await writer.drain()
+            return sent
+        with open(reply.file, 'rb') as f:
+            offset, count = reply.span or (0, os.fstat(f.fileno()).st_size)
+            writer.write(self._head(reply.status, reply.headers + [('Content-Length', str(count))], reply.reason))
+            await writer.drain()
+            if head:
+                return 0
+            await asyncio.get_running_loop().sendfile(writer.transport, f, offset, count)
+            return count
+
+    async def _stream_versions(self, writer):
+        start = time.perf_counter()
+        writer.write(self._head(200, [('Content-Type', 'text/event-stream'), ('Cache-Control', 'no-store'),
+                                      ('Connection', 'close')]))
+        writer.write(SSE_PREAMBLE)
+        if self.metrics is not None:
+            self.metrics.observe(LIVERELOAD_EVENTS, 200, 0, time.perf_counter() - start)
+            self.metrics.stream_opened()
+        try:
+            sent = None
+            while True:
+                bumped = self._bumped
+                if _version == sent:
+                    try:
+                        await asyncio.wait_for(bumped.wait(), SSE_KEEPALIVE_SECONDS)
+                    except asyncio.TimeoutError:
+                        writer.write(SSE_KEEPALIVE)
+                        await writer.drain()
+                        continue
+                sent = _version
+                writer.write(f'data: {sent}\n\n'.encode())
+                await writer.drain()
+        finally:
+            if self.metrics is not None:
+                self.metrics.stream_closed()
+
+
+async def serve_async(port, site=None, metrics=None):
+    server = AsyncServer(site, metrics)
+    loop = asyncio.get_running_loop()
+    _bump_listeners.append(lambda: loop.call_soon_threadsafe(server.notify))
+    listener = await asyncio.start_server(server.handle, port=port)
+    async with listener:
+        await listener.serve_forever()
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Serve the site with live reload.")
+    parser.add_argument('port', nargs='?', type=int, default=8000, help="port to listen on (default 8000)")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help="serve from one asyncio event loop instead of a thread per connection")
+    parser.add_argument('--prod', action='store_true',
+                        help="serve the site as built at startup from a fixed route table, without live reload")
+    parser.add_argument('--metrics', nargs='?', type=float, const=60, metavar='SECONDS',
+                        help=f"record request metrics, serve them at {METRICS_PATH} and print a summary "
+                             f"every SECONDS (default 60, 0 = never)")
+    args = parser.parse_args()
+
+    metrics = None
+    if args.metrics is not None:
+        metrics = Handler.metrics = Metrics()
+        if args.metrics > 0:
+            print_summaries(metrics, args.metrics)
+
     observer = Observer()
-    watcher = ReloadWatcher()
-    observer.schedule(watcher, '.', recursive=False)
-    if Path('articles').exists():
-        observer.schedule(watcher, 'articles', recursive=True)
-    if Path('presentations').exists():
-        observer.schedule(watcher, 'presentations', recursive=True)
-    observer.start()
-
-    httpd = ThreadingHTTPServer(('', PORT), Handler)
+    site = None
+    if args.prod:
+        start = time.perf_counter()
+        site = Handler.site = ProdSite('.')
+        print(f"✓ {len(site.routes)} routes ready in {time.perf_counter() - start:.2f}s "
+              f"(--prod: no live reload, restart after a rebuild)")
+    else:
+        watcher = ReloadWatcher()
+        observer.schedule(watcher, '.', recursive=False)
+        if Path('articles').exists():
+            observer.schedule(watcher, 'articles', recursive=True)
+        if Path('presentations').exists():
+            observer.schedule(watcher, 'presentations', recursive=True)
+        observer.start()
+
     try:
-        httpd.serve_forever()
+        if args.use_async:
+            asyncio.run(serve_async(args.port, site, metrics))
+        else:
+            ThreadingHTTPServer(('', args.port), Handler).serve_forever()
     except KeyboardInterrupt:
         pass
     finally:
-        observer.stop()
-        observer.join()
+        if observer.is_alive():
+            observer.stop()
+            observer.join()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,144 @@
+"""Per-stage build timings for ``generate.py --profile``.
+
+Off by default: laps() hands back a no-op and span() a null context, so an
+ordinary build pays one function call per stage. When enabled, every stage
+records its wall and CPU time; report() prints where the build went and
+write_trace() dumps the events in Chrome trace-event format (open it in
+chrome://tracing or https://ui.perfetto.dev) to compare builds over time.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+_enabled = False
+# (stage, subject, start, wall, cpu, pid, tid), times in seconds.
+_events = []
+# Stages recorded by timed(): they wrap a whole article/deck, so the stage
+# table leaves them out (their inner stages are already counted).
+_outer = set()
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = on
+
+
+def enabled():
+    return _enabled
+
+
+def _record(name, subject, start, wall, cpu):
+    _events.append((name, str(subject), start, wall, cpu, os.getpid(), threading.get_native_id()))
+
+
+class _Span:
+    def __init__(self, name, subject):
+        self.name = name
+        self.subject = subject
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        _record(self.name, self.subject, self.start,
+                time.perf_counter() - self.start, time.process_time() - self.cpu)
+
+
+def span(name, subject):
+    return _Span(name, subject) if _enabled else contextlib.nullcontext()
+
+
+def timed(name):
+    """Decorator: time each call as one `name` span, subject = first argument."""
+    _outer.add(name)
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(subject, *args, **kwargs):
+            with span(name, subject):
+                return func(subject, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _no_lap(name):
+    pass
+
+
+def laps(subject):
+    """Stopwatch for a sequence of stages: lap(name) records the time since the
+    previous lap (or since laps() was called) as stage `name`."""
+    if not _enabled:
+        return _no_lap
+    last = [time.perf_counter(), time.process_time()]
+
+    def lap(name):
+        now, cpu = time.perf_counter(), time.process_time()
+        _record(name, subject, last[0], now - last[0], cpu - last[1])
+        last[0], last[1] = now, cpu
+    return lap
+
+
+def call_traced(func, args, kwargs):
+    """Run func in a pool worker with timings on; the events travel back with the result."""
+    enable()
+    _events.clear()  # a forked worker starts with a copy of the parent's
+    result = func(*args, **kwargs)
+    events = list(_events)
+    _events.clear()
+    return result, events
+
+
+def merge(result, events):
+    _events.extend(events)
+    return result
+
+
+def report(limit=15):
+    stages = defaultdict(lambda: [0, 0.0, 0.0])
+    subjects = []
+    for name, subject, _, wall, cpu, _, _ in _events:
+        if name in _outer:
+            subjects.append((wall, cpu, name, subject))
+            continue
+        totals = stages[name]
+        totals[0] += 1
+        totals[1] += wall
+        totals[2] += cpu
+
+    all_wall = sum(t[1] for t in stages.values()) or 1
+    print(f"\n⏱  {'stage':<14}{'calls':>7}{'wall ms':>11}{'cpu ms':>11}{'share':>8}")
+    for name, (calls, wall, cpu) in sorted(stages.items(), key=lambda kv: kv[1][1], reverse=True):
+        print(f"   {name:<14}{calls:>7}{wall * 1e3:>11.1f}{cpu * 1e3:>11.1f}{wall / all_wall:>8.0%}")
+
+    if subjects:
+        print(f"\n   slowest {min(limit, len(subjects))} of {len(subjects)}:")
+        for wall, cpu, name, subject in sorted(subjects, reverse=True)[:limit]:
+            print(f"   {wall * 1e3:>9.1f} ms wall {cpu * 1e3:>9.1f} ms cpu  {name:<8}{subject}")
+
+
+def write_trace(path):
+    if not _events:
+        return
+    t0 = min(event[2] for event in _events)
+    trace = {
+        'displayTimeUnit': 'ms',
+        'traceEvents': [
+            {
+                'name': name, 'cat': 'build', 'ph': 'X',
+                'ts': round((start - t0) * 1e6, 1), 'dur': round(wall * 1e6, 1),
+                'pid': pid, 'tid': tid,
+                'args': {'subject': subject, 'cpu_ms': round(cpu * 1e3, 3)},
+            }
+            for name, subject, start, wall, cpu, pid, tid in sorted(_events, key=lambda e: e[2])
+        ],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(trace, f)